@@ -9,7 +9,9 @@ from typing import Tuple, Set
 
 import geopandas as gpd
 import pandas as pd
+import shapely.wkb
 from sqlalchemy.engine import Engine
+from sqlalchemy.sql import text
 
 from src.digitaltwin.tables import GeospatialLayers, UserLogInfo, create_table, check_table_exists, execute_query
 from src.digitaltwin.get_data_using_geoapis import fetch_vector_data_using_geoapis
@@ -130,13 +132,14 @@ def get_vector_data_id_not_in_db(
     vector_data_ids = set(vector_data[unique_column_name])
     # Fetch the unique IDs from the specified table that intersect with the area of interest
     aoi_polygon = area_of_interest["geometry"][0]
-    query = f"""
+    query = text(f"""
     SELECT DISTINCT {unique_column_name}
     FROM {table_name} AS ids
-    WHERE ST_Intersects(ids.geometry, ST_GeomFromText('{aoi_polygon}', 2193));
-    """
-    # Execute the query and retrieve the IDs present in the database
-    ids_in_db = set(pd.read_sql(query, engine)[unique_column_name])
+    WHERE ST_Intersects(ids.geometry, ST_GeomFromWKB(:aoi_polygon, 2193));
+    """)
+    # Execute the query and retrieve the IDs present in the database directly from the cursor
+    with engine.connect() as conn:
+        ids_in_db = set(conn.execute(query, {"aoi_polygon": aoi_polygon.wkb}).scalars())
     # Find the IDs from vector_data that are not present in the database
     ids_not_in_db = vector_data_ids - ids_in_db
     return ids_not_in_db
@@ -214,29 +217,35 @@ def get_non_intersection_area_from_db(
     create_table(engine, UserLogInfo)
     # Extract the geometry of the catchment area
     catchment_polygon = catchment_area["geometry"][0]
-    # Build the SQL query to find intersections between the user log information and the catchment area
-    query = f"""
-    SELECT *
-    FROM (
-        SELECT *
-        FROM {UserLogInfo.__tablename__}
-        WHERE '{table_name}' = ANY(source_table_list)
-    ) AS sub
-    WHERE ST_Intersects(sub.geometry, ST_GeomFromText('{catchment_polygon}', 2193));
-    """
-    # Execute the SQL query and retrieve the intersections as a GeoDataFrame
-    user_log_intersections = gpd.GeoDataFrame.from_postgis(query, engine, geom_col="geometry")
+    # Build the SQL query to compute, in a single round trip, the number of user log information entries intersecting
+    # the catchment area and the part of the catchment area not covered by them (keeping only polygonal parts)
+    query = text(f"""
+    SELECT
+        COUNT(*) AS intersection_count,
+        ST_AsBinary(ST_CollectionExtract(
+            ST_Difference(ST_GeomFromWKB(:catchment_polygon, 2193), ST_Union(uli.geometry)), 3
+        )) AS non_intersection_geometry
+    FROM {UserLogInfo.__tablename__} AS uli
+    WHERE :table_name = ANY(uli.source_table_list)
+    AND ST_Intersects(uli.geometry, ST_GeomFromWKB(:catchment_polygon, 2193));
+    """)
+    # Execute the SQL query and retrieve the intersection count and the non-intersecting geometry
+    with engine.connect() as conn:
+        intersection_count, non_intersection_wkb = conn.execute(
+            query, {"catchment_polygon": catchment_polygon.wkb, "table_name": table_name}).one()
     # Check if there are no intersections
-    if user_log_intersections.empty:
+    if intersection_count == 0:
         return catchment_area
-    # Compute the non-intersecting area by overlaying the catchment area with the intersections
-    non_intersection_area = catchment_area.overlay(user_log_intersections, how='difference')
+    # Parse the non-intersecting geometry returned by the database
+    non_intersection_geometry = shapely.wkb.loads(bytes(non_intersection_wkb))
     # Check if the non-intersecting area is empty
-    if non_intersection_area.empty:
+    if non_intersection_geometry.is_empty:
         raise NoNonIntersectionError(
             f"'{table_name}' data for the requested catchment area is already in the database.")
-    else:
-        return non_intersection_area
+    # Replace the catchment area geometry with the non-intersecting geometry
+    non_intersection_area = catchment_area.reset_index(drop=True)
+    non_intersection_area["geometry"] = [non_intersection_geometry]
+    return non_intersection_area
 
 
 def process_new_non_nz_geospatial_layers(
@@ -5,6 +5,8 @@ as well as to create an SQLAlchemy engine for database operations.
 """
 
 import logging
+import os
+from typing import Dict
 
 from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
@@ -17,6 +19,30 @@ log = logging.getLogger(__name__)
 
 Base = declarative_base()
 
+# Engines created by get_engine(), keyed by database URL, so that their connection pools are reused within a process
+ENGINES: Dict[str, Engine] = {}
+
+
+def dispose_engines_after_fork() -> None:
+    """
+    Replace the connection pools of the cached engines in a newly forked child process (e.g. a Celery prefork
+    worker), so that the child never uses the pooled connections inherited from its parent process.
+
+    Returns
+    -------
+    None
+        This function does not return any value.
+    """
+    for engine in ENGINES.values():
+        # Discard the inherited pool without closing its connections, which still belong to the parent process
+        engine.dispose(close=False)
+
+
+# Pooled connections must not be shared across fork(), so give every forked child process fresh connection pools.
+# os.register_at_fork is only available on Unix, where fork() exists; Windows never forks, so nothing is needed there
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=dispose_engines_after_fork)
+
 
 def get_database() -> Engine:
     """
@@ -66,7 +92,8 @@ def get_connection_from_profile() -> Engine:
 
 def get_engine(host: str, port: str, db: str, username: str, password: str) -> Engine:
     """
-    Get SQLAlchemy engine using credentials.
+    Get SQLAlchemy engine using credentials. The engine is created once per set of credentials in each process and
+    reused by subsequent calls, so its connection pool is shared rather than re-established for every call.
 
     Parameters
     ----------
@@ -87,6 +114,9 @@ def get_engine(host: str, port: str, db: str, username: str, password: str) -> E
         The engine used to connect to the database.
     """
     url = f'postgresql://{username}:{password}@{host}:{port}/{db}'
-    engine = create_engine(url)
+    # Reuse the engine for these credentials if it has already been created, otherwise create it
+    engine = ENGINES.get(url)
+    if engine is None:
+        engine = ENGINES.setdefault(url, create_engine(url))
     Base.metadata.create_all(engine)
     return engine
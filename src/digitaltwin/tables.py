@@ -3,15 +3,23 @@
 This script contains SQLAlchemy models for various database tables and utility functions for database operations.
 """
 
+import csv
 from datetime import datetime, timezone
+from io import StringIO
+from typing import Iterable, List, TYPE_CHECKING
 
 from geoalchemy2 import Geometry
 from sqlalchemy import Boolean, Column, DateTime, inspect, Integer, String
 from sqlalchemy.dialects.postgresql import ARRAY
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session
 from sqlalchemy.schema import CheckConstraint, PrimaryKeyConstraint
+from sqlalchemy.sql import text
+
+if TYPE_CHECKING:
+    # pandas' private table representation, only needed for the type hint of psql_insert_copy
+    from pandas.io.sql import SQLTable
 
 Base = declarative_base()
 
@@ -77,7 +85,8 @@ class UserLogInfo(Base):
     __tablename__ = "user_log_information"
     unique_id = Column(Integer, primary_key=True, autoincrement=True)
     source_table_list = Column(ARRAY(String), comment="associated tables (geospatial layers)")
-    created_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc), comment="log created datetime")
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc),
+                        comment="log created datetime")
     geometry = Column(Geometry("POLYGON", srid=2193))
 
 
@@ -135,7 +144,8 @@ class RiverNetwork(Base):
                             comment="An identifier for the river network associated with each run")
     network_path = Column(String, comment="path to the rec river network file")
     network_data_path = Column(String, comment="path to the rec river network data file for the AOI")
-    created_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc), comment="output created datetime")
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc),
+                        comment="output created datetime")
     geometry = Column(Geometry("POLYGON", srid=2193))
 
 
@@ -162,7 +172,8 @@ class BGFloodModelOutput(Base):
     unique_id = Column(Integer, primary_key=True, autoincrement=True)
     file_name = Column(String, comment="name of the flood model output file")
     file_path = Column(String, comment="path to the flood model output file")
-    created_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc), comment="output created datetime")
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc),
+                        comment="output created datetime")
     geometry = Column(Geometry("POLYGON", srid=2193))
 
 
@@ -232,6 +243,31 @@ def check_table_exists(engine: Engine, table_name: str, schema: str = "public")
     return inspector.has_table(table_name, schema=schema)
 
 
+def create_spatial_index(engine: Engine, table_name: str, geom_col: str = "geometry") -> None:
+    """
+    Create a GiST spatial index on the geometry column of a table in the database if it doesn't already exist.
+    The index is named the same way as those created by GeoAlchemy2, so an existing index is not duplicated.
+
+    Parameters
+    ----------
+    engine : Engine
+        The engine used to connect to the database.
+    table_name : str
+        The name of the table to create the spatial index on.
+    geom_col : str = "geometry"
+        The name of the geometry column to index. Defaults to "geometry".
+
+    Returns
+    -------
+    None
+        This function does not return any value.
+    """
+    index_name = f"idx_{table_name}_{geom_col}"
+    query = text(f'CREATE INDEX IF NOT EXISTS "{index_name}" ON "{table_name}" USING GIST ("{geom_col}");')
+    with engine.begin() as conn:
+        conn.execute(query)
+
+
 def execute_query(engine: Engine, query) -> None:
     """
     Execute the given query on the provided engine using a session.
@@ -261,3 +297,43 @@ def execute_query(engine: Engine, query) -> None:
         except Exception as error:
             session.rollback()
             raise error
+
+
+def psql_insert_copy(table: "SQLTable", conn: Connection, keys: List[str], data_iter: Iterable[tuple]) -> None:
+    """
+    Insert data into a PostgreSQL table using COPY, which is much faster than INSERT statements for bulk data.
+    Intended to be passed as the 'method' argument of pd.DataFrame.to_sql().
+
+    Unlike INSERT statements, COPY in CSV format loads empty strings as NULL, as missing values and empty strings are
+    both written as empty fields. Only use it for data without empty strings, such as the HIRDS rainfall tables and
+    the 'building_flood_status' table, where missing values (e.g. the 'rcp' and 'time_period' of historical rainfall
+    data) are meant to be NULL.
+
+    Parameters
+    ----------
+    table : pandas.io.sql.SQLTable
+        The pandas representation of the database table to insert the data into.
+    conn : Connection
+        The connection used to insert the data.
+    keys : List[str]
+        The names of the columns to insert the data into.
+    data_iter : Iterable[tuple]
+        The rows of data to be inserted.
+
+    Returns
+    -------
+    None
+        This function does not return any value.
+    """
+    # Write the rows to an in-memory CSV file, where missing values and empty strings are written as empty fields,
+    # which COPY loads as NULL
+    csv_buffer = StringIO()
+    csv.writer(csv_buffer, lineterminator="\n").writerows(data_iter)
+    csv_buffer.seek(0)
+    # Construct the COPY statement for the table and columns
+    columns = ", ".join(f'"{key}"' for key in keys)
+    table_name = f'"{table.schema}"."{table.name}"' if table.schema else f'"{table.name}"'
+    copy_statement = f"COPY {table_name} ({columns}) FROM STDIN WITH CSV"
+    # Copy the data into the table using the underlying DBAPI connection
+    with conn.connection.cursor() as cursor:
+        cursor.copy_expert(sql=copy_statement, file=csv_buffer)
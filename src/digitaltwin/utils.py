@@ -3,17 +3,37 @@
 This script provides utility functions for logging configuration and geospatial data manipulation.
 """
 
-import inspect
 import logging
 import pathlib
+import sys
 import warnings
 from enum import IntEnum
 
 import geopandas as gpd
 from sqlalchemy.engine import Engine
+from sqlalchemy.sql import text
 
 log = logging.getLogger(__name__)
 
+# Loggers to prevent messages from reaching the root logger, resolved once at import
+EXCLUDED_LOGGERS = [
+    logging.getLogger(logger_name)
+    for logger_name in [
+        "urllib3",
+        "fiona",
+        "botocore",
+        "pyproj",
+        "asyncio",
+        "rasterio",
+        "scrapy",
+        "distributed",
+        "selenium",
+        "s3transfer"
+    ]
+]
+# Whether the root logger has already been configured by setup_logging()
+_LOGGING_CONFIGURED = False
+
 
 class LogLevel(IntEnum):
     """
@@ -52,8 +72,11 @@ def log_execution_info() -> None:
     None
         This function does not return any value.
     """
+    # Skip inspecting the call stack and formatting the message when debug messages are not being logged
+    if not log.isEnabledFor(logging.DEBUG):
+        return
     # Obtain the stack frame of the calling function (two frames up in the call stack)
-    stack_frame = inspect.currentframe().f_back.f_back
+    stack_frame = sys._getframe(2)
     # Extract the name of the script file (without the path) where the function is being executed
     script_name = pathlib.Path(stack_frame.f_globals["__file__"]).name
     # Extract the name of the function currently being executed
@@ -85,34 +108,22 @@ def setup_logging(log_level: LogLevel = LogLevel.INFO) -> None:
     None
         This function does not return any value.
     """
-    # Define the logging format and date format
-    logging_format = "%(asctime)s | %(levelname)-8s | %(name)-30s %(lineno)4d | %(funcName)-50s | %(message)s"
-    date_format = "%Y-%m-%d %H:%M:%S"
-    # Create and configure the root logger with the specified log level and formats
-    logging.basicConfig(level=log_level, format=logging_format, datefmt=date_format)
-    # Enable capturing Python warnings and redirect them to the logging system
-    logging.captureWarnings(True)
-    # Suppress (ignore) Python warnings from appearing in the console
-    warnings.simplefilter("ignore")
-    # List of loggers to prevent messages from reaching the root logger
-    loggers_to_exclude = [
-        "urllib3",
-        "fiona",
-        "botocore",
-        "pyproj",
-        "asyncio",
-        "rasterio",
-        "scrapy",
-        "distributed",
-        "selenium",
-        "s3transfer"
-    ]
-    # Iterate through the loggers to exclude
-    for logger_name in loggers_to_exclude:
-        # Get the logger instance for each name in the list
-        logger = logging.getLogger(logger_name)
-        # Disable log message propagation from these loggers to the root logger
-        logger.propagate = False
+    global _LOGGING_CONFIGURED
+    # Configure logging only once, as later calls would not change the root logger configuration anyway
+    if not _LOGGING_CONFIGURED:
+        # Define the logging format and date format
+        logging_format = "%(asctime)s | %(levelname)-8s | %(name)-30s %(lineno)4d | %(funcName)-50s | %(message)s"
+        date_format = "%Y-%m-%d %H:%M:%S"
+        # Create and configure the root logger with the specified log level and formats
+        logging.basicConfig(level=log_level, format=logging_format, datefmt=date_format)
+        # Enable capturing Python warnings and redirect them to the logging system
+        logging.captureWarnings(True)
+        # Suppress (ignore) Python warnings from appearing in the console
+        warnings.simplefilter("ignore")
+        # Disable log message propagation from the excluded loggers to the root logger
+        for logger in EXCLUDED_LOGGERS:
+            logger.propagate = False
+        _LOGGING_CONFIGURED = True
     # Log the execution of the function in the script
     log_execution_info()
 
@@ -133,6 +144,10 @@ def get_catchment_area(catchment_area: gpd.GeoDataFrame, to_crs: int = 2193) ->
     gpd.GeoDataFrame
         A GeoDataFrame representing the catchment area with the transformed CRS.
     """
+    # Skip the transformation if the catchment area is already in the requested CRS, still returning a copy so that
+    # callers can modify the result without modifying the original catchment area, as with to_crs
+    if catchment_area.crs is not None and catchment_area.crs.to_epsg() == to_crs:
+        return catchment_area.copy()
     return catchment_area.to_crs(to_crs)
 
 
@@ -152,14 +167,14 @@ def get_nz_boundary(engine: Engine, to_crs: int = 2193) -> gpd.GeoDataFrame:
     gpd.GeoDataFrame
         A GeoDataFrame representing the boundary of New Zealand in the specified CRS.
     """
-    # Query the 'region_geometry' table from the database using the provided engine
-    query = "SELECT * FROM region_geometry;"
-    region_geometry = gpd.GeoDataFrame.from_postgis(query, engine, geom_col="geometry")
-    # Dissolve and explode the geometries to get the boundary of New Zealand
-    nz_boundary = region_geometry.dissolve(aggfunc="sum").explode(index_parts=True).reset_index(level=0, drop=True)
-    # Calculate the area of each geometry and sort them in descending order
-    nz_boundary["geometry_area"] = nz_boundary["geometry"].area
-    nz_boundary = nz_boundary.sort_values(by="geometry_area", ascending=False).head(1)
-    # Convert to the desired coordinate reference system (CRS)
-    nz_boundary = nz_boundary.to_crs(to_crs)
+    # Dissolve and explode the 'region_geometry' geometries, keep the largest part as the boundary of New Zealand and
+    # convert it to the desired coordinate reference system (CRS), all within the database
+    query = text("""
+    SELECT ST_Transform(nz_parts.geometry, :to_crs) AS geometry, ST_Area(nz_parts.geometry) AS geometry_area
+    FROM (SELECT (ST_Dump(ST_Union(rg.geometry))).geom AS geometry FROM region_geometry AS rg) AS nz_parts
+    ORDER BY geometry_area DESC
+    LIMIT 1;
+    """)
+    nz_boundary = gpd.GeoDataFrame.from_postgis(
+        query, engine, geom_col="geometry", crs=to_crs, params={"to_crs": to_crs})
     return nz_boundary
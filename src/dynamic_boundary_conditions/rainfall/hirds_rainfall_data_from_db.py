@@ -4,37 +4,90 @@ Retrieve all rainfall data for sites within the catchment area from the database
 """
 
 import logging
-from typing import Optional
+from typing import List, Optional
 
 import geopandas as gpd
 import pandas as pd
 from sqlalchemy.engine import Engine
+from sqlalchemy.sql import text
 
 from src.dynamic_boundary_conditions.rainfall import hirds_rainfall_data_to_db
 
 log = logging.getLogger(__name__)
 
 
-def filter_for_duration(rain_data: pd.DataFrame, duration: str) -> pd.DataFrame:
+def get_sites_rainfall_data(
+        engine: Engine,
+        site_ids: List[str],
+        rcp: Optional[float],
+        time_period: Optional[str],
+        ari: float,
+        duration: str,
+        idf: bool) -> pd.DataFrame:
     """
-    Filter the HIRDS rainfall data for a requested duration.
+    Retrieve rainfall data from the database for the requested sites based on the user-requested scenario,
+    using a single query for all sites.
 
     Parameters
     ----------
-    rain_data : pd.DataFrame
-        HIRDS rainfall data in Pandas DataFrame format.
+    engine : Engine
+        The engine used to connect to the database.
+    site_ids : List[str]
+        HIRDS rainfall site IDs.
+    rcp : Optional[float]
+        Representative Concentration Pathway (RCP) value. Valid options are 2.6, 4.5, 6.0, 8.5, or None
+        for historical data.
+    time_period : Optional[str]
+        Future time period. Valid options are "2031-2050", "2081-2100", or None for historical data.
+    ari : float
+        Average Recurrence Interval (ARI) value. Valid options are 1.58, 2, 5, 10, 20, 30, 40, 50, 60, 80, 100, or 250.
     duration : str
         Storm duration. Valid options are: '10m', '20m', '30m', '1h', '2h', '6h', '12h', '24h', '48h', '72h',
         '96h', '120h', or 'all'.
+    idf : bool
+        Set to False for rainfall depth data, and True for rainfall intensity data.
 
     Returns
     -------
     pd.DataFrame
-        Filtered rainfall data for the requested duration.
+        Rainfall data for the requested sites based on the user-requested scenario, ordered as in `site_ids`.
+
+    Raises
+    ------
+    ValueError
+        If rcp and time_period arguments are inconsistent.
     """
-    if duration != "all":
-        # Filter the rain_data DataFrame to include only the relevant columns for the requested duration
-        rain_data = rain_data[["site_id", "category", "rcp", "time_period", "ari", "aep", duration]]
+    # Get the relevant rainfall data table name from the idf parameter
+    rain_table_name = hirds_rainfall_data_to_db.db_rain_table_name(idf)
+    log.info(f"Retrieving the requested '{rain_table_name}' scenario data for sites {site_ids} from the database.")
+    # Check for inconsistent rcp and time_period arguments
+    if (rcp is None and time_period is not None) or (rcp is not None and time_period is None):
+        raise ValueError("Inconsistent arguments provided. "
+                         "For historical data, both 'rcp' and 'time_period' should be None. "
+                         "If 'rcp' is None, 'time_period' should also be None, and vice versa.")
+    elif rcp is not None and time_period is not None:
+        # Filter for specific rcp and time_period
+        scenario_filter = "rcp = :rcp AND time_period = :time_period"
+    else:
+        # Filter for historical data (rcp is None and time_period is None)
+        scenario_filter = "rcp IS NULL AND time_period IS NULL AND category = 'hist'"
+    # Select only the requested duration column, unless all durations are requested
+    if duration == "all":
+        columns = "*"
+    else:
+        duration_column = engine.dialect.identifier_preparer.quote(duration)
+        columns = f"site_id, category, rcp, time_period, ari, aep, {duration_column}"
+    # Query all the requested sites at once, keeping the order of the given site IDs
+    query = text(f"""
+    SELECT {columns}
+    FROM {rain_table_name}
+    WHERE site_id = ANY(:site_ids) AND {scenario_filter} AND ari = :ari
+    ORDER BY array_position(:site_ids, site_id);
+    """)
+    params = {"site_ids": list(site_ids), "ari": ari}
+    if rcp is not None:
+        params.update(rcp=rcp, time_period=time_period)
+    rain_data = pd.read_sql_query(query, engine, params=params)
     return rain_data
 
 
@@ -78,35 +131,7 @@ def get_one_site_rainfall_data(
     ValueError
         If rcp and time_period arguments are inconsistent.
     """
-    # Get the relevant rainfall data table name from the idf parameter
-    rain_table_name = hirds_rainfall_data_to_db.db_rain_table_name(idf)
-    log.info(f"Retrieving the requested '{rain_table_name}' scenario data for site {site_id} from the database.")
-    # Check for inconsistent rcp and time_period arguments
-    if (rcp is None and time_period is not None) or (rcp is not None and time_period is None):
-        raise ValueError("Inconsistent arguments provided. "
-                         "For historical data, both 'rcp' and 'time_period' should be None. "
-                         "If 'rcp' is None, 'time_period' should also be None, and vice versa.")
-    elif rcp is not None and time_period is not None:
-        # Query for specific rcp and time_period
-        query = f"""
-        SELECT *
-        FROM {rain_table_name}
-        WHERE site_id='{site_id}' AND rcp='{rcp}' AND time_period='{time_period}' AND ari={ari};
-        """
-        rain_data = pd.read_sql_query(query, engine)
-    else:
-        # Query for historical data (rcp is None and time_period is None)
-        query = f"""
-        SELECT *
-        FROM {rain_table_name}
-        WHERE site_id='{site_id}' AND rcp IS NULL AND time_period IS NULL AND ari={ari};
-        """
-        rain_data = pd.read_sql_query(query, engine)
-        # Filter for historical data
-        rain_data.query("category == 'hist'", inplace=True)
-    # Filter for duration
-    rain_data = filter_for_duration(rain_data, duration)
-    return rain_data
+    return get_sites_rainfall_data(engine, [site_id], rcp, time_period, ari, duration, idf)
 
 
 def rainfall_data_from_db(
@@ -147,12 +172,10 @@ def rainfall_data_from_db(
     """
     # Get the site IDs within the catchment area
     site_ids_in_catchment = hirds_rainfall_data_to_db.get_site_ids_in_catchment(sites_in_catchment)
-    # Initialize an empty DataFrame to store the rainfall data
-    rain_data_in_catchment = pd.DataFrame()
-    # Iterate over each site ID in the catchment area
-    for site_id in site_ids_in_catchment:
-        # Retrieve the rainfall data for the site
-        rain_data = get_one_site_rainfall_data(engine, site_id, rcp, time_period, ari, duration, idf)
-        # Concatenate the site's rainfall data to the overall catchment data
-        rain_data_in_catchment = pd.concat([rain_data_in_catchment, rain_data], ignore_index=True)
+    # Check if there are sites within the catchment area
+    if not site_ids_in_catchment:
+        return pd.DataFrame()
+    # Retrieve the rainfall data for all the sites in a single query
+    rain_data_in_catchment = get_sites_rainfall_data(
+        engine, site_ids_in_catchment, rcp, time_period, ari, duration, idf)
     return rain_data_in_catchment
@@ -3,12 +3,15 @@
 Store the rainfall data for all the sites within the catchment area in the database.
 """
 
+import functools
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List
 
 import pandas as pd
 import geopandas as gpd
 from sqlalchemy.engine import Engine
+from sqlalchemy.sql import text
 
 from src.digitaltwin import tables
 from src.dynamic_boundary_conditions.rainfall import rainfall_data_from_hirds
@@ -74,25 +77,25 @@ def get_site_ids_not_in_db(engine: Engine, site_ids_in_catchment: List[str], idf
     """
     # Get the relevant rainfall data table name from the idf parameter
     rain_table_name = db_rain_table_name(idf)
-    # Construct the query to retrieve the distinct site IDs from the rainfall data table
-    query = f"SELECT DISTINCT site_id FROM {rain_table_name};"
-    # Execute the query and retrieve the site IDs in the database as a DataFrame
-    site_ids_in_db = pd.read_sql_query(query, engine)
-    # Convert the DataFrame to a list of site IDs in the database
-    site_ids_in_db = site_ids_in_db["site_id"].tolist()
-    # Find the site IDs in site_ids_in_catchment that are not present in site_ids_in_db
-    site_ids_not_in_db = list(set(site_ids_in_catchment).difference(site_ids_in_db))
+    # Construct the query to find the site IDs in site_ids_in_catchment that are not present in the rainfall data table
+    query = text(f"""
+    SELECT site_id FROM unnest(CAST(:site_ids AS text[])) AS catchment_sites(site_id)
+    EXCEPT
+    SELECT site_id FROM {rain_table_name};
+    """)
+    # Execute the query and retrieve the site IDs not in the database as a DataFrame
+    site_ids_not_in_db = pd.read_sql_query(query, engine, params={"site_ids": list(site_ids_in_catchment)})
+    # Convert the DataFrame to a list of site IDs not in the database
+    site_ids_not_in_db = site_ids_not_in_db["site_id"].tolist()
     return site_ids_not_in_db
 
 
-def add_rainfall_data_to_db(engine: Engine, site_id: str, idf: bool) -> None:
+def fetch_rainfall_data_from_hirds(site_id: str, idf: bool) -> pd.DataFrame:
     """
-    Store the rainfall data for a specific site in the database.
+    Fetch the rainfall data for a specific site from the HIRDS website and convert it to a tabular format.
 
     Parameters
     ----------
-    engine : Engine
-        The engine used to connect to the database.
     site_id : str
         HIRDS rainfall site ID.
     idf : bool
@@ -100,8 +103,8 @@ def add_rainfall_data_to_db(engine: Engine, site_id: str, idf: bool) -> None:
 
     Returns
     -------
-    None
-        This function does not return any value.
+    pd.DataFrame
+        Rainfall data for the requested site in tabular format.
     """
     # Get the relevant rainfall data table name from the idf parameter
     rain_table_name = db_rain_table_name(idf)
@@ -110,19 +113,47 @@ def add_rainfall_data_to_db(engine: Engine, site_id: str, idf: bool) -> None:
     site_data = rainfall_data_from_hirds.get_data_from_hirds(site_id, idf)
     # Extract the layout structure of the data
     layout_structure = rainfall_data_from_hirds.get_layout_structure_of_data(site_data)
+    # Convert all the blocks of the data to a tabular format at once
+    rain_data = rainfall_data_from_hirds.convert_layout_to_tabular_data(site_data, site_id, layout_structure)
+    return rain_data
+
 
+def store_rainfall_data_to_db(engine: Engine, rain_data: pd.DataFrame, idf: bool) -> None:
+    """
+    Store the tabular rainfall data of a specific site in the database.
+
+    Parameters
+    ----------
+    engine : Engine
+        The engine used to connect to the database.
+    rain_data : pd.DataFrame
+        Rainfall data for a specific site in tabular format.
+    idf : bool
+        Set to False for rainfall depth data, and True for rainfall intensity data.
+
+    Returns
+    -------
+    None
+        This function does not return any value.
+    """
+    # Get the relevant rainfall data table name from the idf parameter
+    rain_table_name = db_rain_table_name(idf)
+    site_id = rain_data["site_id"].iloc[0]
     log.info(f"Adding '{rain_table_name}' data for site {site_id} to the database.")
-    # Iterate over each block structure in the layout structure
-    for block_structure in layout_structure:
-        # Convert the data to a tabular format
-        rain_data = rainfall_data_from_hirds.convert_to_tabular_data(site_data, site_id, block_structure)
-        # Store the tabular data in the relevant rainfall data table in the database
-        rain_data.to_sql(rain_table_name, engine, index=False, if_exists="append")
+    # Store the tabular data in the relevant rainfall data table in the database using COPY
+    rain_data.to_sql(rain_table_name, engine, index=False, if_exists="append", method=tables.psql_insert_copy)
 
 
-def add_each_site_rainfall_data(engine: Engine, site_ids_list: List[str], idf: bool) -> None:
+def add_each_site_rainfall_data(
+        engine: Engine,
+        site_ids_list: List[str],
+        idf: bool,
+        max_workers: int = 8,
+        max_db_writers: int = 2) -> None:
     """
     Add rainfall data for each site in the site_ids_list to the database.
+    Fetching from the HIRDS website and storing in the database run as two concurrent stages, so that sites keep
+    being fetched while the data of already fetched sites is being stored.
 
     Parameters
     ----------
@@ -132,14 +163,37 @@ def add_each_site_rainfall_data(engine: Engine, site_ids_list: List[str], idf: b
         List of rainfall sites' IDs.
     idf : bool
         Set to False for rainfall depth data, and True for rainfall intensity data.
+    max_workers : int = 8
+        The maximum number of sites fetched from the HIRDS website at the same time. Default is 8.
+    max_db_writers : int = 2
+        The maximum number of sites stored in the database at the same time. Default is 2.
 
     Returns
     -------
     None
         This function does not return any value.
     """
-    for site_id in site_ids_list:
-        add_rainfall_data_to_db(engine, site_id, idf)
+    store_site_rainfall_data = functools.partial(store_rainfall_data_to_db, engine, idf=idf)
+    # Check if the rainfall data table already exists, as concurrent writers must not all try to create it
+    rain_table_exists = tables.check_table_exists(engine, db_rain_table_name(idf))
+    with ThreadPoolExecutor(max_workers=max_workers) as fetch_executor, \
+            ThreadPoolExecutor(max_workers=max_db_writers) as store_executor:
+        # Fetch the rainfall data of all sites
+        fetch_futures = [
+            fetch_executor.submit(fetch_rainfall_data_from_hirds, site_id, idf) for site_id in site_ids_list]
+        store_futures = []
+        # Store the rainfall data of each site as soon as it has been fetched
+        for fetch_future in as_completed(fetch_futures):
+            rain_data = fetch_future.result()
+            if rain_table_exists:
+                store_futures.append(store_executor.submit(store_site_rainfall_data, rain_data))
+            else:
+                # Store the first fetched site serially so that the table is created by a single writer
+                store_site_rainfall_data(rain_data)
+                rain_table_exists = True
+        # Consume the results so that any exception raised while storing a site is propagated
+        for store_future in store_futures:
+            store_future.result()
 
 
 def rainfall_data_to_db(engine: Engine, sites_in_catchment: gpd.GeoDataFrame, idf: bool = False) -> None:
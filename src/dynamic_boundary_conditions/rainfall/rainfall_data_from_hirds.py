@@ -11,6 +11,13 @@ import requests
 from requests.structures import CaseInsensitiveDict
 import pandas as pd
 
+# Matches the header line of each data block, i.e. lines that contain "(mm) ::" for depth data or "(mm/hr) ::" for
+# intensity data
+BLOCK_HEADER_PATTERN = re.compile(r"^.*\(mm(?:/hr)?\) ::.*$", re.MULTILINE)
+# Match the rcp and time_period values within a block header line
+RCP_PATTERN = re.compile(r"(\d*\.\d*)")
+TIME_PERIOD_PATTERN = re.compile(r"(\d{4}-\d{4})")
+
 
 def get_site_url_key(site_id: str, idf: bool) -> str:
     """
@@ -137,41 +144,46 @@ def get_layout_structure_of_data(site_data: str) -> List[BlockStructure]:
         List of BlockStructure named tuples representing the layout structure of the fetched rainfall data.
     """
     layout_structure = []
-    # Read the site_data text string line by line with a for loop
-    for index, line in enumerate(StringIO(site_data)):
-        # Get lines that contain "(mm) ::" for depth data or "(mm/hr) ::" for intensity data
-        if "(mm) ::" in line or "(mm/hr) ::" in line:
-            # Add the row number to skip_rows list
-            skip_rows = index + 1
-            # Add the obtained rcp and time_period values to list
-            rcp_result = re.search(r"(\d*\.\d*)", line)
-            period_result = re.search(r"(\d{4}-\d{4})", line)
-            if rcp_result is not None or period_result is not None:
-                # Extract the rcp value from the line
-                rcp = float(rcp_result[0])
-                # Extract the time_period value from the line
-                time_period = period_result[0]
-            else:
-                # When there are no rcp and time_period values (i.e. for historical data)
-                # Add nan or None to the list depending on the data type
-                rcp = float("nan")
-                time_period = None
-            # Assign category to list based on the content of the line
-            if "standard error" in line:
-                category = "hist_stderr"
-            elif "Historical Data" in line:
-                category = "hist"
-            else:
-                category = "proj"
-            # Create a BlockStructure named tuple and append it to the layout_structure list
-            layout_structure.append(BlockStructure(skip_rows, rcp, time_period, category))
+    # Line index of the most recently found block header line, and the position in site_data where that line starts
+    index, line_start = 0, 0
+    # Find all lines that contain "(mm) ::" for depth data or "(mm/hr) ::" for intensity data in a single pass
+    for match in BLOCK_HEADER_PATTERN.finditer(site_data):
+        # Get the line index by counting the line breaks since the previously found line
+        index += site_data.count("\n", line_start, match.start())
+        line_start = match.start()
+        line = match.group()
+        # Add the row number to skip_rows list
+        skip_rows = index + 1
+        # Add the obtained rcp and time_period values to list
+        rcp_result = RCP_PATTERN.search(line)
+        period_result = TIME_PERIOD_PATTERN.search(line)
+        if rcp_result is not None or period_result is not None:
+            # Extract the rcp value from the line
+            rcp = float(rcp_result[0])
+            # Extract the time_period value from the line
+            time_period = period_result[0]
+        else:
+            # When there are no rcp and time_period values (i.e. for historical data)
+            # Add nan or None to the list depending on the data type
+            rcp = float("nan")
+            time_period = None
+        # Assign category to list based on the content of the line
+        if "standard error" in line:
+            category = "hist_stderr"
+        elif "Historical Data" in line:
+            category = "hist"
+        else:
+            category = "proj"
+        # Create a BlockStructure named tuple and append it to the layout_structure list
+        layout_structure.append(BlockStructure(skip_rows, rcp, time_period, category))
     return layout_structure
 
 
-def convert_to_tabular_data(
-        site_data: str, site_id: str, block_structure: BlockStructure) -> pd.DataFrame:
+def convert_layout_to_tabular_data(
+        site_data: str, site_id: str, layout_structure: List[BlockStructure]) -> pd.DataFrame:
     """
-    Convert the fetched rainfall data for the requested site into a Pandas DataFrame.
+    Convert all the blocks of the fetched rainfall data for the requested site into a single Pandas DataFrame.
+    The data rows of all blocks are parsed at once, rather than parsing each block separately.
 
     Parameters
     ----------
@@ -179,23 +191,37 @@ def convert_to_tabular_data(
         Fetched rainfall data text string from the HIRDS website for the requested rainfall site.
     site_id : str
         HIRDS rainfall site ID.
-    block_structure : BlockStructure
-        The layout structure of the fetched rainfall data, containing skip rows, RCP, time period, and category.
+    layout_structure : List[BlockStructure]
+        List of BlockStructure named tuples representing the layout structure of the fetched rainfall data.
 
     Returns
     -------
     pd.DataFrame
-        Rainfall data for the requested site in tabular format.
+        Rainfall data of all the blocks for the requested site in tabular format.
+
+    Raises
+    ------
+    ValueError
+        If the blocks of the fetched rainfall data do not all have the same column names.
     """
-    # Extract values from the block_structure tuple
-    skip_rows, rcp, time_period, category = block_structure
-    # Read the site_data text string into a DataFrame
-    rainfall_data = pd.read_csv(StringIO(site_data), skiprows=skip_rows, nrows=12)
-    # Insert additional columns to the DataFrame
-    rainfall_data.insert(0, "site_id", site_id)
-    rainfall_data.insert(1, "category", category)
-    rainfall_data.insert(2, "rcp", rcp)
-    rainfall_data.insert(3, "time_period", time_period)
+    site_data_lines = site_data.split("\n")
+    # Use the column names of the first block for the combined data
+    column_names = site_data_lines[layout_structure[0].skip_rows]
+    block_rows = [column_names]
+    for skip_rows, *_ in layout_structure:
+        # Check that the block has the same column names as the first block
+        if site_data_lines[skip_rows] != column_names:
+            raise ValueError(f"Rainfall data blocks for site {site_id} do not all have the same column names.")
+        # Add the 12 rows of data of the block
+        block_rows.extend(site_data_lines[skip_rows + 1:skip_rows + 13])
+    # Read the data rows of all blocks into a single DataFrame
+    rainfall_data = pd.read_csv(StringIO("\n".join(block_rows)))
+    # Get the site_id, category, rcp and time_period of each block, repeated for each of its rows
+    block_info = pd.DataFrame(layout_structure).drop(columns="skip_rows")
+    block_info = block_info.loc[block_info.index.repeat(12)].reset_index(drop=True)
+    block_info.insert(0, "site_id", site_id)
+    # Combine the block information with the rainfall data
+    rainfall_data = pd.concat([block_info[["site_id", "category", "rcp", "time_period"]], rainfall_data], axis=1)
     # Convert column names to lowercase
     rainfall_data.columns = rainfall_data.columns.str.lower()
     return rainfall_data
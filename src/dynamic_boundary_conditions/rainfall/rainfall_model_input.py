@@ -99,12 +99,11 @@ def mean_catchment_rainfall(hyetograph_data: pd.DataFrame, sites_coverage: gpd.G
     mean_catchment_rain = hyetograph_data.copy()
     # Get the list of rainfall site IDs
     sites_column_list = list(mean_catchment_rain.columns.values[:-3])
-
-    for site_id in sites_column_list:
-        # Get the coverage area percentage for the current site
-        site_area_percent = sites_coverage.query("site_id == @site_id")["area_percent"].values[0]
-        # Multiply the rainfall intensities of the current site by its coverage area percentage
-        mean_catchment_rain[f"{site_id}"] = mean_catchment_rain[f"{site_id}"] * site_area_percent
+    # Index the coverage area percentages by site ID so each site is looked up in constant time
+    sites_area_percent = sites_coverage.drop_duplicates(subset="site_id").set_index("site_id")["area_percent"]
+    # Multiply the rainfall intensities of each site by its coverage area percentage
+    mean_catchment_rain[sites_column_list] = mean_catchment_rain[sites_column_list].mul(
+        sites_area_percent.loc[sites_column_list].to_numpy(), axis=1)
     # Calculate the sum from all sites to obtain the mean catchment rainfall intensity
     mean_catchment_rain["rain_intensity_mmhr"] = mean_catchment_rain[sites_column_list].sum(axis=1)
     # Extract the relevant columns: time and the mean catchment rainfall intensity
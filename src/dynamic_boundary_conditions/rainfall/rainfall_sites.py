@@ -92,3 +92,5 @@ def rainfall_sites_to_db(engine: Engine) -> None:
         # Store rainfall sites data in the database
         log.info(f"Adding '{table_name}' data to the database.")
         sites.to_postgis(f'{table_name}', engine, if_exists='replace', index=False)
+    # Ensure the rainfall sites can be spatially queried using an index
+    tables.create_spatial_index(engine, table_name)
@@ -10,6 +10,7 @@ import geopandas as gpd
 import pandas as pd
 from geovoronoi import voronoi_regions_from_coords, points_to_coords
 from sqlalchemy.engine import Engine
+from sqlalchemy.sql import text
 
 from src.digitaltwin import tables
 from src.digitaltwin.utils import get_nz_boundary
@@ -36,14 +37,16 @@ def get_sites_within_aoi(engine: Engine, area_of_interest: gpd.GeoDataFrame) ->
     """
     # Extract the geometry of the area of interest
     aoi_polygon = area_of_interest["geometry"].iloc[0]
-    # Construct the query to fetch rainfall sites within the area of interest
-    query = f"""
-    SELECT *
+    # Construct the query to fetch rainfall sites within the area of interest, selecting only the columns that are
+    # used to build the Thiessen polygons
+    query = text("""
+    SELECT rs.site_id, rs.site_name, rs.geometry
     FROM rainfall_sites AS rs
-    WHERE ST_Within(rs.geometry, ST_GeomFromText('{aoi_polygon}', 4326));
-    """
+    WHERE ST_Within(rs.geometry, ST_GeomFromWKB(:aoi_polygon, 4326));
+    """)
     # Execute the query and retrieve the results as a GeoDataFrame
-    sites_in_aoi = gpd.GeoDataFrame.from_postgis(query, engine, geom_col="geometry", crs=4326)
+    sites_in_aoi = gpd.GeoDataFrame.from_postgis(
+        query, engine, geom_col="geometry", crs=4326, params={"aoi_polygon": aoi_polygon.wkb})
     # Reset the index
     sites_in_aoi.reset_index(drop=True, inplace=True)
     return sites_in_aoi
@@ -87,11 +90,9 @@ def thiessen_polygons_calculator(
     # Generate Voronoi regions from the coordinates within the area of interest
     region_polys, region_pts = voronoi_regions_from_coords(coordinates, aoi_polygon, per_geom=False)
     voronoi_regions = list(region_polys.values())
-    sites_in_voronoi_order = pd.DataFrame()
-    for site_index in region_pts.values():
-        site_index = site_index[0]
-        site = sites_in_aoi.filter(items=[site_index], axis=0)
-        sites_in_voronoi_order = pd.concat([sites_in_voronoi_order, site])
+    # Collect the sites in the order of the Voronoi regions and concatenate them once
+    sites = [sites_in_aoi.filter(items=[site_index[0]], axis=0) for site_index in region_pts.values()]
+    sites_in_voronoi_order = pd.concat(sites, copy=False)
     # Create a GeoDataFrame with Thiessen polygons, site information, and area covered by each rainfall site
     rainfall_sites_voronoi = gpd.GeoDataFrame(sites_in_voronoi_order, geometry=voronoi_regions, crs=4326)
     rainfall_sites_voronoi["area_in_km2"] = rainfall_sites_voronoi.to_crs(3857).area / 1e6
@@ -129,6 +130,8 @@ def thiessen_polygons_to_db(engine: Engine) -> None:
         # Store the Thiessen polygons data in the database
         log.info(f"Adding '{table_name}' data to the database.")
         rainfall_sites_voronoi.to_postgis(f"{table_name}", engine, if_exists="replace")
+    # Ensure the Thiessen polygons can be spatially queried using an index
+    tables.create_spatial_index(engine, table_name)
 
 
 def thiessen_polygons_from_db(engine: Engine, catchment_area: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
@@ -151,13 +154,14 @@ def thiessen_polygons_from_db(engine: Engine, catchment_area: gpd.GeoDataFrame)
     # Extract the geometry of the catchment area
     catchment_polygon = catchment_area["geometry"].iloc[0]
     # Construct the query to get rainfall sites coverage areas (Thiessen polygons)
-    query = f"""
+    query = text("""
     SELECT *
     FROM rainfall_sites_voronoi AS rsv
-    WHERE ST_Intersects(rsv.geometry, ST_GeomFromText('{catchment_polygon}', 4326));
-    """
+    WHERE ST_Intersects(rsv.geometry, ST_GeomFromWKB(:catchment_polygon, 4326));
+    """)
     # Retrieve the data from the database
-    sites_in_catchment = gpd.GeoDataFrame.from_postgis(query, engine, geom_col="geometry", crs=4326)
+    sites_in_catchment = gpd.GeoDataFrame.from_postgis(
+        query, engine, geom_col="geometry", crs=4326, params={"catchment_polygon": catchment_polygon.wkb})
     # Reset the index
     sites_in_catchment.reset_index(drop=True, inplace=True)
     return sites_in_catchment
@@ -233,11 +233,13 @@ def get_existing_network_metadata_from_db(engine: Engine, catchment_area: gpd.Ge
     # Extract the catchment polygon from the catchment area and convert it to Well-Known Text (WKT) format
     catchment_polygon = catchment_area["geometry"].iloc[0]
     catchment_polygon_wkt = shapely.wkt.dumps(catchment_polygon, rounding_precision=6)
-    # Query the REC Network Output table to find existing REC river network metadata for the catchment area
+    # Query the REC Network Output table to find existing REC river network metadata for the catchment area.
+    # Only one existing REC river network is ever used, so there is no need to fetch more than one row
     query = f"""
     SELECT *
     FROM {RiverNetwork.__tablename__}
-    WHERE ST_Equals(geometry, ST_GeomFromText('{catchment_polygon_wkt}', 2193));
+    WHERE ST_Equals(geometry, ST_GeomFromText('{catchment_polygon_wkt}', 2193))
+    LIMIT 1;
     """
     # Fetch the query result as a GeoPandas DataFrame
     existing_network_meta = gpd.GeoDataFrame.from_postgis(query, engine, geom_col="geometry")
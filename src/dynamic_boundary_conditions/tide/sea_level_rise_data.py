@@ -19,6 +19,7 @@ from selenium import webdriver
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
 from sqlalchemy.engine import Engine
+from sqlalchemy.sql import text
 
 from src import config
 from src.digitaltwin import tables
@@ -200,49 +201,50 @@ def store_slr_data_to_db(engine: Engine) -> None:
         slr_nz.to_postgis(table_name, engine, index=False, if_exists="replace")
 
 
-def get_closest_slr_data(engine: Engine, single_query_loc: pd.Series) -> gpd.GeoDataFrame:
+def get_closest_slr_data(engine: Engine, query_locs: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     """
-    Retrieve the closest sea level rise data for a single query location from the database.
+    Retrieve the closest sea level rise data for each of the query locations from the database in a single query.
 
     Parameters
     ----------
     engine : Engine
         The engine used to connect to the database.
-    single_query_loc : pd.Series
-        Pandas Series containing the location coordinate and additional information used for retrieval.
+    query_locs : gpd.GeoDataFrame
+        A GeoDataFrame containing the location coordinates (in EPSG:4326) and positions used for retrieval.
 
     Returns
     -------
     gpd.GeoDataFrame
-        A GeoDataFrame containing the closest sea level rise data for the query location from the database.
+        A GeoDataFrame containing the closest sea level rise data for each query location from the database,
+        ordered by query location.
     """
-    # Create a GeoDataFrame with the query location geometry
-    query_loc_geom = gpd.GeoDataFrame(geometry=[single_query_loc["geometry"]], crs=4326)
-    # Convert the query location geometry to the desired coordinate reference system (CRS)
-    query_loc_geom = query_loc_geom.to_crs(2193).reset_index(drop=True)
-    # Prepare the query to retrieve sea level rise data based on the query location.
-    # The subquery calculates the distances between the query location and each location in the 'sea_level_rise' table.
-    # It then identifies the location with the shortest distance, indicating the closest location to the query location,
-    # and retrieves the 'siteid' associated with that closest location, along with its corresponding distance value.
-    # The outer query joins the sea_level_rise table with the inner subquery, merging the results to retrieve the
-    # relevant data, which includes the calculated distance. By matching the closest location's 'siteid' from the
-    # inner subquery with the corresponding data in the sea_level_rise table using the JOIN clause, the outer query
-    # obtains the sea level rise data for the closest location, along with its associated distance value.
-    query = f"""
-    SELECT slr.*, distances.distance
-    FROM sea_level_rise AS slr
-    JOIN (
+    # Convert the geometries of all query locations to the desired coordinate reference system (CRS) at once
+    query_loc_geoms = query_locs["geometry"].to_crs(2193)
+    # Prepare the query to retrieve sea level rise data for all query locations at once.
+    # The query locations are passed as arrays and expanded into rows, numbered in their original order.
+    # For each query location, the lateral subquery calculates the distances between the query location and each
+    # location in the 'sea_level_rise' table, and identifies the 'siteid' of the closest location, along with its
+    # corresponding distance value. Joining the sea_level_rise table on that 'siteid' then retrieves the sea level rise
+    # data for the closest location of each query location, along with its associated distance value and the position
+    # of the query location.
+    query = text("""
+    SELECT slr.*, closest.distance, query_locs.loc_position AS position, query_locs.loc_order
+    FROM unnest(CAST(:positions AS text[]), CAST(:geometries AS bytea[]))
+        WITH ORDINALITY AS query_locs(loc_position, loc_geometry, loc_order)
+    CROSS JOIN LATERAL (
         SELECT siteid,
-        ST_Distance(ST_Transform(geometry, 2193), ST_GeomFromText('{query_loc_geom["geometry"][0]}', 2193)) AS distance
+        ST_Distance(ST_Transform(geometry, 2193), ST_GeomFromWKB(query_locs.loc_geometry, 2193)) AS distance
         FROM sea_level_rise
         ORDER BY distance
         LIMIT 1
-    ) AS distances ON slr.siteid = distances.siteid;
-    """
+    ) AS closest
+    JOIN sea_level_rise AS slr ON slr.siteid = closest.siteid
+    ORDER BY query_locs.loc_order;
+    """)
     # Execute the query and retrieve the data as a GeoDataFrame
-    query_data = gpd.GeoDataFrame.from_postgis(query, engine, geom_col="geometry")
-    # Add the position information to the retrieved data
-    query_data["position"] = single_query_loc["position"]
+    query_data = gpd.GeoDataFrame.from_postgis(
+        query, engine, geom_col="geometry",
+        params={"positions": query_locs["position"].tolist(), "geometries": [geom.wkb for geom in query_loc_geoms]})
     return query_data
 
 
@@ -264,17 +266,12 @@ def get_slr_data_from_db(engine: Engine, tide_data: gpd.GeoDataFrame) -> gpd.Geo
     """
     log.info("Retrieving 'sea_level_rise' data for the requested catchment area from the database.")
     # Select unique query locations from the tide data
-    tide_data_loc = tide_data[['position', 'geometry']].drop_duplicates()
-    # Initialize an empty GeoDataFrame to store the closest sea level rise data for all locations
-    slr_data = gpd.GeoDataFrame()
-    # Iterate over each query location
-    for _, row in tide_data_loc.iterrows():
-        # Retrieve the closest sea level rise data from the database for the current query location
-        query_loc_data = get_closest_slr_data(engine, row)
-        # Add a column to the retrieved data to store the geometry of the tide data location
-        query_loc_data["tide_data_loc"] = row["geometry"]
-        # Concatenate the closest sea level rise data for the query location with the overall sea level rise data
-        slr_data = pd.concat([slr_data, query_loc_data])
-    # Reset the index of the closest sea level rise data
-    slr_data = gpd.GeoDataFrame(slr_data).reset_index(drop=True)
+    tide_data_loc = tide_data[['position', 'geometry']].drop_duplicates().reset_index(drop=True)
+    # Retrieve the closest sea level rise data from the database for all query locations at once
+    slr_data = get_closest_slr_data(engine, tide_data_loc)
+    # Add a column to the retrieved data to store the geometry of the tide data location, using the query location
+    # order (numbered from 1) returned by the database
+    slr_data["tide_data_loc"] = tide_data_loc["geometry"].to_numpy()[slr_data["loc_order"].to_numpy() - 1]
+    # Drop the query location order column and reset the index of the closest sea level rise data
+    slr_data = slr_data.drop(columns="loc_order").reset_index(drop=True)
     return slr_data
@@ -4,8 +4,13 @@ Fetch tide data from NIWA using the Tide API based on the specified approach, da
 """
 
 import asyncio
+import hashlib
 import io
+import json
 import logging
+import os
+import pathlib
+import time
 from datetime import date, timedelta
 from math import ceil
 from typing import Dict, List, Tuple, Union, Optional
@@ -23,31 +28,39 @@ log = logging.getLogger(__name__)
 # URLs for retrieving tide data from the NIWA Tide API in JSON and CSV formats, respectively
 TIDE_API_URL_DATA = "https://api.niwa.co.nz/tides/data"
 TIDE_API_URL_DATA_CSV = "https://api.niwa.co.nz/tides/data.csv"
-
-
-def get_query_loc_coords_position(query_loc_row: gpd.GeoDataFrame) -> Tuple[float, float, str]:
+# Maximum number of simultaneous connections to the NIWA Tide API shared by all query locations
+TIDE_API_MAX_CONNECTIONS = 8
+# Maximum number of retries, and the initial backoff in seconds, when the Tide API rate limits a request (HTTP 429)
+TIDE_API_MAX_RETRIES = 5
+TIDE_API_RETRY_BACKOFF_SECS = 1
+# Default number of days after which cached tide data is fetched again, overridden by TIDE_CACHE_MAX_AGE_DAYS
+# in the .env file, where 0 disables the tide cache
+TIDE_CACHE_MAX_AGE_DAYS = 30
+
+
+def get_query_loc_coords_position(
+        tide_query_loc: gpd.GeoDataFrame) -> Tuple[List[float], List[float], List[str]]:
     """
-    Get the latitude, longitude, and position of a query location.
+    Get the latitudes, longitudes, and positions of all query locations.
 
     Parameters
     ----------
-    query_loc_row : gpd.GeoDataFrame
-        A GeoDataFrame representing a query location used to fetch tide data from NIWA using the tide API.
+    tide_query_loc : gpd.GeoDataFrame
+        A GeoDataFrame containing the query coordinates and their positions used to fetch tide data from NIWA
+        using the tide API.
 
     Returns
     -------
-    Tuple[float, float, str]
-        A tuple containing the latitude, longitude, and position of the query location.
+    Tuple[List[float], List[float], List[str]]
+        A tuple containing the latitudes, longitudes, and positions of the query locations, in the same order as
+        the rows of 'tide_query_loc'.
     """
-    # Reset the index of the query location GeoDataFrame
-    query_loc_row = query_loc_row.reset_index(drop=True)
-    # Get the position from the query location GeoDataFrame
-    position = query_loc_row['position'][0]
-    # Get the query location point
-    query_loc_point = query_loc_row['geometry'][0]
-    # Get the longitude and latitude from the query location point
-    long, lat = query_loc_point.x, query_loc_point.y
-    return lat, long, position
+    # Get the positions from the query locations GeoDataFrame
+    positions = tide_query_loc['position'].tolist()
+    # Get the longitudes and latitudes from the query location points in a single vectorized pass
+    longs = tide_query_loc['geometry'].x.tolist()
+    lats = tide_query_loc['geometry'].y.tolist()
+    return lats, longs, positions
 
 
 def get_date_ranges(
@@ -102,21 +115,22 @@ def get_date_ranges(
     return date_ranges
 
 
-def gen_tide_query_param_list(
-        lat: Union[int, float],
-        long: Union[int, float],
+def gen_tide_query_param_lists(
+        lats: List[Union[int, float]],
+        longs: List[Union[int, float]],
         date_ranges: Dict[date, int],
         interval_mins: Optional[int] = None,
-        datum: DatumType = DatumType.LAT) -> List[Dict[str, Union[str, int]]]:
+        datum: DatumType = DatumType.LAT) -> List[List[Dict[str, Union[str, int]]]]:
     """
-    Generate a list of API query parameters used to retrieve tide data for the requested period.
+    Generate, for each query location, a list of API query parameters used to retrieve tide data for the
+    requested period.
 
     Parameters
     ----------
-    lat : Union[int, float]
-        Latitude in the range of -29 to -53 (e.g., -30.876).
-    long : Union[int, float]
-        Longitude in the range of 160 to 180 and -175 to -180 (e.g., -175.543).
+    lats : List[Union[int, float]]
+        Latitudes of the query locations, each in the range of -29 to -53 (e.g., -30.876).
+    longs : List[Union[int, float]]
+        Longitudes of the query locations, each in the range of 160 to 180 and -175 to -180 (e.g., -175.543).
     date_ranges : Dict[date, int]
         Dictionary of start date and number of days for each API call needed to retrieve tide data
         for the requested period.
@@ -129,36 +143,36 @@ def gen_tide_query_param_list(
 
     Returns
     -------
-    List[Dict[str, Union[str, int]]]
-        A list of API query parameters used to retrieve tide data for the requested period.
+    List[List[Dict[str, Union[str, int]]]]
+        A list containing, for each query location, the list of API query parameters used to retrieve tide data
+        for the requested period.
 
     Raises
     ------
     ValueError
-        - If the latitude is outside the range of -29 to -53.
-        - If the longitude is outside the range of 160 to 180 or -175 to -180.
+        - If any latitude is outside the range of -29 to -53.
+        - If any longitude is outside the range of 160 to 180 or -175 to -180.
         - If the time interval is provided and outside the range of 10 to 1440.
     """
-    # Verify that the provided arguments meet the query parameter requirements of the Tide API
-    if not (-53 <= lat <= -29):
-        raise ValueError(f"latitude is {lat}, must range from -29 to -53.")
-    if not ((160 <= long <= 180) or (-180 <= long <= -175)):
-        raise ValueError(f"longitude is {long}, must range from 160 to 180 or from -175 to -180.")
+    # Verify that the provided arguments meet the query parameter requirements of the Tide API for all locations
+    lats_array, longs_array = np.asarray(lats, dtype=float), np.asarray(longs, dtype=float)
+    invalid_lats = lats_array[~((-53 <= lats_array) & (lats_array <= -29))]
+    if invalid_lats.size > 0:
+        raise ValueError(f"latitude is {invalid_lats[0]}, must range from -29 to -53.")
+    invalid_longs = longs_array[~(((160 <= longs_array) & (longs_array <= 180)) |
+                                  ((-180 <= longs_array) & (longs_array <= -175)))]
+    if invalid_longs.size > 0:
+        raise ValueError(f"longitude is {invalid_longs[0]}, must range from 160 to 180 or from -175 to -180.")
     if interval_mins is not None and not (10 <= interval_mins <= 1440):
         raise ValueError(f"interval is {interval_mins}, must range from 10 to 1440.")
 
     # Get the NIWA API key
     niwa_api_key = config.get_env_variable("NIWA_API_KEY")
 
-    # Create an empty list to store the API query parameters
-    query_param_list = []
-    # Iterate over each item in the 'date_ranges' dictionary
+    # Create the query parameters shared by all query locations once for each date range
+    date_range_params = []
     for start_date, number_of_days in date_ranges.items():
-        # Create a dictionary to store the query parameters for the current date range
-        query_param = {
-            "apikey": niwa_api_key,
-            "lat": str(lat),
-            "long": str(long),
+        date_range_param = {
             "numberOfDays": number_of_days,
             "startDate": start_date.isoformat(),
             "datum": datum.value
@@ -166,10 +180,165 @@ def gen_tide_query_param_list(
         # Check if an interval is provided
         if interval_mins is not None:
             # Add interval to the query parameters
-            query_param["interval"] = interval_mins
-        # Append the current query parameters to the list
-        query_param_list.append(query_param)
-    return query_param_list
+            date_range_param["interval"] = interval_mins
+        date_range_params.append(date_range_param)
+
+    # Combine the location of each query location with the query parameters of each date range
+    query_param_lists = [
+        [
+            {"apikey": niwa_api_key, "lat": str(lat), "long": str(long), **date_range_param}
+            for date_range_param in date_range_params
+        ]
+        for lat, long in zip(lats, longs)
+    ]
+    return query_param_lists
+
+
+def get_tide_cache_path(
+        query_param: Dict[str, Union[str, int]],
+        url: str = TIDE_API_URL_DATA) -> Optional[pathlib.Path]:
+    """
+    Get the file path used to cache the tide data fetched with the provided query parameters.
+
+    Parameters
+    ----------
+    query_param : Dict[str, Union[str, int]]
+        The query parameters used to retrieve tide data for a specific location and time period.
+    url : str = TIDE_API_URL_DATA
+        Tide API HTTP request URL. Defaults to `TIDE_API_URL_DATA`.
+
+    Returns
+    -------
+    Optional[pathlib.Path]
+        The file path of the cached tide data, named after a hash of the URL and the query parameters
+        (excluding the API key), or None if the tide cache directory is not available.
+    """
+    try:
+        # Get the data directory from the environment variable and define the tide cache directory
+        tide_cache_dir = config.get_env_variable("DATA_DIR", cast_to=pathlib.Path) / "tide_cache"
+        # Create the tide cache directory if it does not already exist
+        tide_cache_dir.mkdir(parents=True, exist_ok=True)
+    except (KeyError, OSError) as e:
+        # The tide cache is best-effort, so fetch the tide data without it
+        log.warning(f"Tide cache is not available, fetching tide data without it: {e}")
+        return None
+    # Build a stable key from the URL and the query parameters, excluding the API key
+    cache_key = json.dumps(
+        {"url": url, **{key: value for key, value in query_param.items() if key != "apikey"}}, sort_keys=True)
+    # Hash the key to get the cache file name
+    cache_name = hashlib.blake2b(cache_key.encode("utf-8"), digest_size=16).hexdigest()
+    return tide_cache_dir / f"{cache_name}.parquet"
+
+
+def read_tide_cache(cache_path: pathlib.Path, max_age_days: int) -> Optional[pd.DataFrame]:
+    """
+    Read the cached tide data, unless it does not exist, has expired, or cannot be read.
+
+    Parameters
+    ----------
+    cache_path : pathlib.Path
+        The file path of the cached tide data.
+    max_age_days : int
+        The number of days after which the cached tide data has expired.
+
+    Returns
+    -------
+    Optional[pd.DataFrame]
+        The cached tide data, without geometry, or None if it is not available.
+    """
+    try:
+        # Treat missing or expired cached tide data as not available
+        if not cache_path.is_file() or time.time() - cache_path.stat().st_mtime > max_age_days * 24 * 60 * 60:
+            return None
+        return pd.read_parquet(cache_path)
+    except (OSError, ValueError) as e:
+        # The tide cache is best-effort, so fetch the tide data again if the cached tide data cannot be read
+        log.warning(f"Failed to read cached tide data from {cache_path}: {e}")
+        return None
+
+
+def write_tide_cache(cache_path: pathlib.Path, tide_df: pd.DataFrame) -> None:
+    """
+    Write the tide data to the tide cache, logging rather than raising any failure.
+
+    Parameters
+    ----------
+    cache_path : pathlib.Path
+        The file path of the cached tide data.
+    tide_df : pd.DataFrame
+        The tide data to cache, without geometry.
+
+    Returns
+    -------
+    None
+        This function does not return any value.
+    """
+    # Write to a temporary file first so that a partially written file is never read
+    temp_cache_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        tide_df.to_parquet(temp_cache_path, index=False)
+        os.replace(temp_cache_path, cache_path)
+    except (OSError, ValueError) as e:
+        # The tide cache is best-effort, so only remove any partially written file
+        log.warning(f"Failed to cache tide data to {cache_path}: {e}")
+        temp_cache_path.unlink(missing_ok=True)
+
+
+async def get_tide_api_response(
+        session: aiohttp.ClientSession,
+        query_param: Dict[str, Union[str, int]],
+        url: str = TIDE_API_URL_DATA) -> Union[Dict, str]:
+    """
+    Send a GET request to the Tide API and return the response body, retrying with exponential backoff while the
+    Tide API is rate limiting requests (HTTP 429).
+
+    Parameters
+    ----------
+    session : aiohttp.ClientSession
+        An instance of `aiohttp.ClientSession` used for making HTTP requests.
+    query_param : Dict[str, Union[str, int]]
+        The query parameters used to retrieve tide data for a specific location and time period.
+    url : str = TIDE_API_URL_DATA
+        Tide API HTTP request URL. Defaults to `TIDE_API_URL_DATA`.
+        Can be either `TIDE_API_URL_DATA` or `TIDE_API_URL_DATA_CSV`.
+
+    Returns
+    -------
+    Union[Dict, str]
+        The response body, parsed as JSON for `TIDE_API_URL_DATA` and as text for `TIDE_API_URL_DATA_CSV`.
+    """
+    for attempt in range(TIDE_API_MAX_RETRIES + 1):
+        # Send a GET request to the provided URL with the query parameters
+        async with session.get(url, params=query_param) as resp:
+            # Return the response body unless the request was rate limited and can still be retried
+            if resp.status != 429 or attempt == TIDE_API_MAX_RETRIES:
+                return await resp.json() if url == TIDE_API_URL_DATA else await resp.text()
+            # Wait for the time requested by the Tide API, otherwise back off exponentially
+            retry_after = resp.headers.get("Retry-After", "")
+        delay = float(retry_after) if retry_after.isdigit() else TIDE_API_RETRY_BACKOFF_SECS * 2 ** attempt
+        log.debug(f"Tide API rate limit reached, retrying in {delay} seconds.")
+        await asyncio.sleep(delay)
+
+
+def tide_data_to_geodataframe(tide_df: pd.DataFrame) -> gpd.GeoDataFrame:
+    """
+    Convert the tide data of a single query location to a GeoDataFrame, using the query location point as the
+    geometry of every row.
+
+    Parameters
+    ----------
+    tide_df : pd.DataFrame
+        The tide data of a single query location, containing the 'latitude' and 'longitude' columns.
+
+    Returns
+    -------
+    gpd.GeoDataFrame
+        A GeoDataFrame containing the tide data.
+    """
+    # The geometry is created here rather than stored in the tide cache, as a CRS read in the separate thread used
+    # for the tide cache is slow to use in any other thread
+    geometry = gpd.points_from_xy(tide_df['longitude'], tide_df['latitude'])
+    return gpd.GeoDataFrame(tide_df, geometry=geometry, crs=4326)
 
 
 async def fetch_tide_data(
@@ -193,43 +362,65 @@ async def fetch_tide_data(
     -------
     gpd.GeoDataFrame
         A GeoDataFrame containing the fetched tide data.
+
+    Raises
+    ------
+    ValueError
+        If the response does not contain any tide data.
     """
+    # Get the number of days after which cached tide data is fetched again, where 0 disables the tide cache
+    cache_max_age_days = config.get_env_variable(
+        "TIDE_CACHE_MAX_AGE_DAYS", default=TIDE_CACHE_MAX_AGE_DAYS, cast_to=int)
+    cache_path = None
+    if cache_max_age_days > 0:
+        # Tide predictions for the same query rarely change, so return the cached tide data if available,
+        # running the file I/O in a separate thread so that the other API calls are not blocked
+        cache_path = await asyncio.to_thread(get_tide_cache_path, query_param, url)
+        if cache_path is not None:
+            cached_tide_df = await asyncio.to_thread(read_tide_cache, cache_path, cache_max_age_days)
+            if cached_tide_df is not None:
+                return tide_data_to_geodataframe(cached_tide_df)
     # Send a GET request to the provided URL with the query parameters
-    async with session.get(url, params=query_param) as resp:
-        if url == TIDE_API_URL_DATA:
-            # Process response as JSON
-            resp_dict = await resp.json()
-            # Create a DataFrame from the 'values' field of the response dictionary
-            tide_df = pd.DataFrame(resp_dict['values'])
-            # Insert the 'datum', 'latitude', and 'longitude' columns at specific locations in the DataFrame
-            tide_df.insert(loc=0, column='datum', value=resp_dict['metadata']['datum'])
-            tide_df.insert(loc=1, column='latitude', value=resp_dict['metadata']['latitude'])
-            tide_df.insert(loc=2, column='longitude', value=resp_dict['metadata']['longitude'])
-        else:
-            # Process response as text
-            resp_text = await resp.text()
-            # Read the response text as a CSV into a DataFrame and reset the index
-            data = pd.read_csv(io.StringIO(resp_text)).reset_index()
-            # Find the index of the row containing the header 'TIME'
-            header_index = data[data['index'] == 'TIME'].index[0]
-            # Extract the rows starting from the row after the header row and reset the index
-            tide_df = data[header_index + 1:].reset_index(drop=True)
-            # Convert the header names to lowercase for consistency
-            tide_df.columns = [header.lower() for header in data.iloc[header_index].tolist()]
-            # Convert the 'value' column to float data type
-            tide_df['value'] = tide_df['value'].astype(float)
-            # Insert the 'datum', 'latitude', and 'longitude' columns at specific locations in the DataFrame
-            tide_df.insert(loc=0, column='datum', value=data[data['index'] == 'Datum'].values[0][1].strip())
-            tide_df.insert(loc=1, column='latitude', value=float(data[data['index'] == 'Latitude'].values[0][1]))
-            tide_df.insert(loc=2, column='longitude', value=float(data[data['index'] == 'Longitude'].values[0][1]))
-        # Create a geometry column based on longitude and latitude coordinates
-        geometry = gpd.points_from_xy(tide_df['longitude'], tide_df['latitude'])
-        # Convert the DataFrame to a GeoDataFrame by adding geometry column and setting CRS
-        tide_df = gpd.GeoDataFrame(tide_df, geometry=geometry, crs=4326)
-        return tide_df
+    resp_body = await get_tide_api_response(session, query_param, url)
+    if url == TIDE_API_URL_DATA:
+        # Process response as JSON
+        resp_dict = resp_body
+        # Get the 'datum', 'latitude', and 'longitude' from the 'metadata' field of the response dictionary
+        datum = resp_dict['metadata']['datum']
+        latitude = resp_dict['metadata']['latitude']
+        longitude = resp_dict['metadata']['longitude']
+        # Create a DataFrame from the 'values' field of the response dictionary
+        tide_values = pd.DataFrame(resp_dict['values'])
+    else:
+        # Process response as text
+        resp_text = resp_body
+        # Read the response text as a CSV into a DataFrame and reset the index
+        data = pd.read_csv(io.StringIO(resp_text)).reset_index()
+        # Get the 'datum', 'latitude', and 'longitude' from the metadata rows of the response
+        datum = data[data['index'] == 'Datum'].values[0][1].strip()
+        latitude = float(data[data['index'] == 'Latitude'].values[0][1])
+        longitude = float(data[data['index'] == 'Longitude'].values[0][1])
+        # Find the index of the row containing the header 'TIME'
+        header_index = data[data['index'] == 'TIME'].index[0]
+        # Extract the rows starting from the row after the header row and reset the index
+        tide_values = data[header_index + 1:].reset_index(drop=True)
+        # Convert the header names to lowercase for consistency
+        tide_values.columns = [header.lower() for header in data.iloc[header_index].tolist()]
+        # Convert the 'value' column to float data type
+        tide_values['value'] = tide_values['value'].astype(float)
+    # Check that the response contains tide values, so that an empty result is never cached
+    if tide_values.empty:
+        raise ValueError(f"No tide data returned for latitude {latitude} and longitude {longitude}.")
+    # Create the DataFrame in one go, broadcasting the 'datum', 'latitude', and 'longitude' to every row
+    tide_df = pd.DataFrame({'datum': datum, 'latitude': latitude, 'longitude': longitude, **tide_values})
+    # Cache the tide data in a separate thread so that the other API calls are not blocked
+    if cache_path is not None:
+        await asyncio.to_thread(write_tide_cache, cache_path, tide_df)
+    return tide_data_to_geodataframe(tide_df)
 
 
 async def fetch_tide_data_for_requested_period(
+        session: aiohttp.ClientSession,
         query_param_list: List[Dict[str, Union[str, int]]],
         url: str = TIDE_API_URL_DATA) -> gpd.GeoDataFrame:
     """
@@ -237,6 +428,8 @@ async def fetch_tide_data_for_requested_period(
 
     Parameters
     ----------
+    session : aiohttp.ClientSession
+        An instance of `aiohttp.ClientSession` used for making HTTP requests.
     query_param_list : List[Dict[str, Union[str, int]]]
         A list of API query parameters used to retrieve tide data for the requested period.
     url : str = TIDE_API_URL_DATA
@@ -263,15 +456,12 @@ async def fetch_tide_data_for_requested_period(
 
     while True:
         try:
-            tasks = []
-            async with aiohttp.ClientSession() as session:
-                # Create a list of tasks to fetch tide data for each query parameter
-                for query_param in query_param_list:
-                    tasks.append(fetch_tide_data(session, query_param=query_param, url=url))
-                # Wait for all tasks to complete and retrieve the results
-                query_results = await asyncio.gather(*tasks, return_exceptions=True)
-                # Concatenate the results into a single GeoDataFrame and reset the index
-                tide_data = gpd.GeoDataFrame(pd.concat(query_results)).reset_index(drop=True)
+            # Create a list of tasks to fetch tide data for each query parameter
+            tasks = [fetch_tide_data(session, query_param=query_param, url=url) for query_param in query_param_list]
+            # Wait for all tasks to complete and retrieve the results
+            query_results = await asyncio.gather(*tasks, return_exceptions=True)
+            # Concatenate the results into a single GeoDataFrame and reset the index
+            tide_data = gpd.GeoDataFrame(pd.concat(query_results, ignore_index=True, copy=False))
             return tide_data
         except TypeError:
             # If a TypeError occurs, it means the Tide API did not return the expected data format.
@@ -285,6 +475,68 @@ async def fetch_tide_data_for_requested_period(
                 raise RuntimeError("Failed to fetch tide data.")
 
 
+async def fetch_tide_data_for_query_locations(
+        query_param_lists: List[List[Dict[str, Union[str, int]]]],
+        url: str = TIDE_API_URL_DATA) -> List[gpd.GeoDataFrame]:
+    """
+    Fetch tide data for the requested period for all query locations concurrently, sharing a single HTTP session
+    (and its connection pool) across every API call.
+
+    Parameters
+    ----------
+    query_param_lists : List[List[Dict[str, Union[str, int]]]]
+        A list containing, for each query location, the list of API query parameters used to retrieve tide data
+        for the requested period.
+    url : str = TIDE_API_URL_DATA
+        Tide API HTTP request URL. Defaults to `TIDE_API_URL_DATA`.
+        Can be either `TIDE_API_URL_DATA` or `TIDE_API_URL_DATA_CSV`.
+
+    Returns
+    -------
+    List[gpd.GeoDataFrame]
+        A list of GeoDataFrames containing the fetched tide data for each query location, in the same order as
+        'query_param_lists'.
+    """
+    # Limit the number of simultaneous connections so that connections are reused across all API calls
+    connector = aiohttp.TCPConnector(limit_per_host=TIDE_API_MAX_CONNECTIONS)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        # Create a list of tasks to fetch tide data for the requested period for each query location
+        tasks = [
+            fetch_tide_data_for_requested_period(session, query_param_list, url)
+            for query_param_list in query_param_lists
+        ]
+        # Wait for all tasks to complete and retrieve the results
+        query_loc_tides = await asyncio.gather(*tasks)
+    return list(query_loc_tides)
+
+
+def concat_tide_data_with_categorical_columns(tide_data_list: List[gpd.GeoDataFrame]) -> gpd.GeoDataFrame:
+    """
+    Concatenate tide data, storing the 'datum', 'latitude', and 'longitude' columns, which hold a single value for
+    each query location, as categoricals to reduce memory usage.
+
+    Parameters
+    ----------
+    tide_data_list : List[gpd.GeoDataFrame]
+        A list of tide data to concatenate, each containing the 'datum', 'latitude', and 'longitude' columns.
+
+    Returns
+    -------
+    gpd.GeoDataFrame
+        The concatenated tide data with the 'datum', 'latitude', and 'longitude' columns stored as categoricals.
+    """
+    for column in ['datum', 'latitude', 'longitude']:
+        # Build a categorical data type shared by all the tide data from the distinct values of the column
+        categories = pd.unique(np.concatenate([np.asarray(tide_data[column].unique()) for tide_data in tide_data_list]))
+        column_dtype = pd.CategoricalDtype(categories)
+        # Convert the column of each tide data before concatenating, so that the full object column is never built
+        # and the concatenated column keeps the shared categorical data type
+        for tide_data in tide_data_list:
+            tide_data[column] = tide_data[column].astype(column_dtype)
+    # Concatenate the tide data into a single GeoDataFrame and reset the index
+    return gpd.GeoDataFrame(pd.concat(tide_data_list, ignore_index=True, copy=False))
+
+
 def convert_to_nz_timezone(tide_data_utc: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     """
     Convert the time column in the initially retrieved tide data for the requested period from UTC to NZ timezone.
@@ -301,8 +553,9 @@ def convert_to_nz_timezone(tide_data_utc: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     """
     # Create a copy of the tide data to avoid modifying the original DataFrame
     tide_data = tide_data_utc.copy()
-    # Convert the 'time' column to datetime format
-    tide_data['time'] = pd.to_datetime(tide_data['time'])
+    # Convert the 'time' column to datetime format in UTC, unless it has already been parsed
+    if not pd.api.types.is_datetime64_any_dtype(tide_data['time']):
+        tide_data['time'] = pd.to_datetime(tide_data['time'], utc=True, cache=True)
     # Convert the 'time' column to NZ timezone (Pacific/Auckland)
     tide_data['time'] = tide_data['time'].dt.tz_convert(tz='Pacific/Auckland')
     return tide_data
@@ -339,27 +592,24 @@ def fetch_tide_data_from_niwa(
     """
     # Get the date ranges (i.e., start date and duration used for each API call)
     date_ranges = get_date_ranges(start_date, total_days)
-    # Initialize an empty DataFrame to store the tide data in UTC
-    tide_data_utc = pd.DataFrame()
-    # Get the tide data for each of the tide query locations
-    for _, row in tide_query_loc.iterrows():
-        # Create a temporary GeoDataFrame containing a single query location
-        query_loc_row = gpd.GeoDataFrame([row], crs=tide_query_loc.crs)
-        # Get the latitude, longitude, and position of the query location
-        lat, long, position = get_query_loc_coords_position(query_loc_row)
-        # Generate a list of API query parameters used to retrieve tide data for the requested period
-        query_param_list = gen_tide_query_param_list(lat, long, date_ranges, interval_mins, datum)
-        # Iterate over the list of API query parameters to fetch tide data for the requested period
-        query_loc_tide = asyncio.run(fetch_tide_data_for_requested_period(query_param_list))
-        # Add the 'position' column to indicate the position of the query location
+    # Get the latitudes, longitudes, and positions of all tide query locations
+    lats, longs, positions = get_query_loc_coords_position(tide_query_loc)
+    # Generate the lists of API query parameters used to retrieve tide data for each of the tide query locations
+    query_param_lists = gen_tide_query_param_lists(lats, longs, date_ranges, interval_mins, datum)
+    # Fetch tide data for the requested period for all query locations using a single HTTP session
+    query_loc_tides = asyncio.run(fetch_tide_data_for_query_locations(query_param_lists))
+    # Add the 'position' column to the tide data of each query location to indicate its position
+    for position, query_loc_tide in zip(positions, query_loc_tides):
         query_loc_tide['position'] = position
-        # Concatenate the tide data for the current query location with the overall tide data
-        tide_data_utc = pd.concat([tide_data_utc, query_loc_tide])
+    # Concatenate the tide data of all query locations into a single DataFrame, storing the columns holding a single
+    # value per query location as categoricals
+    tide_data_utc = concat_tide_data_with_categorical_columns(query_loc_tides)
     # Convert the time column from UTC to NZ timezone
     tide_data = convert_to_nz_timezone(tide_data_utc)
-    # Filter out data beyond the requested time period and reset the index
-    end_date = start_date + timedelta(days=total_days - 1)
-    tide_data = tide_data.loc[tide_data['time'].dt.date <= end_date]
+    # Filter out data beyond the requested time period (i.e. from midnight NZ time after the last requested day)
+    # and reset the index
+    end_datetime = pd.Timestamp(start_date + timedelta(days=total_days), tz='Pacific/Auckland')
+    tide_data = tide_data.loc[tide_data['time'] < end_datetime]
     tide_data = tide_data.reset_index(drop=True)
     # Rename columns to standardize column names
     new_col_names = {'time': 'datetime_nz', 'value': 'tide_metres'}
@@ -384,12 +634,8 @@ def get_highest_tide_datetime(tide_data: gpd.GeoDataFrame) -> pd.Timestamp:
     """
     # Find the highest tide value
     max_tide_value = tide_data['tide_metres'].max()
-    # Filter the tide data to include only the rows with the highest tide value
-    highest_tide = tide_data[tide_data['tide_metres'] == max_tide_value]
-    # Sort the filtered data by datetime in descending order to get the most recent highest tide
-    highest_tide = highest_tide.sort_values(by=['datetime_nz'], ascending=False).reset_index(drop=True)
-    # Get the datetime of the most recent highest tide
-    highest_tide_datetime = highest_tide.iloc[0]['datetime_nz']
+    # Get the latest datetime among the rows with the highest tide value, without sorting the tide data
+    highest_tide_datetime = tide_data.loc[tide_data['tide_metres'] == max_tide_value, 'datetime_nz'].max()
     return highest_tide_datetime
 
 
@@ -481,8 +727,8 @@ def fetch_tide_data_around_highest_tide(
     """
     # Group the tide data by position and geometry
     grouped = tide_data.groupby(['position', tide_data['geometry'].to_wkt()])
-    # Create an empty GeoDataFrame to store the tide data around the highest tide
-    tide_data_around_highest_tide = gpd.GeoDataFrame()
+    # Create an empty list to store the tide data around the highest tide for each group
+    highest_tide_data_list = []
     # Iterate over each group in the grouped data
     for _, group_data in grouped:
         # Get the datetime of the most recent highest tide that occurred within the requested time period
@@ -500,10 +746,15 @@ def fetch_tide_data_around_highest_tide(
         # Filter the fetched tide data to include only the data within the tide event time range
         highest_tide_data = highest_tide_data.loc[
             highest_tide_data['datetime_nz'].between(start_datetime, end_datetime)].reset_index(drop=True)
-        # Concatenate the filtered tide data to the existing data around the highest tide
-        tide_data_around_highest_tide = pd.concat([tide_data_around_highest_tide, highest_tide_data])
-    # Reset the index of the data around the highest tide
-    tide_data_around_highest_tide = gpd.GeoDataFrame(tide_data_around_highest_tide).reset_index(drop=True)
+        # Append the filtered tide data to the list of data around the highest tide
+        highest_tide_data_list.append(highest_tide_data)
+    # If there are no query locations, fall back to an empty frame with the same columns as the tide data
+    if not highest_tide_data_list:
+        highest_tide_data_list.append(tide_data.iloc[:0].copy())
+    # Concatenate the data around the highest tide of all groups and reset the index, giving the categorical columns
+    # of all groups the same categories, as concatenating categoricals with different categories falls back to
+    # their original data type
+    tide_data_around_highest_tide = concat_tide_data_with_categorical_columns(highest_tide_data_list)
     return tide_data_around_highest_tide
 
 
@@ -616,8 +867,8 @@ def add_time_information(
 
     # Group the tide data by position and geometry
     grouped = tide_data.groupby(['position', tide_data['geometry'].to_wkt()])
-    # Create a new GeoDataFrame to store tide data with time information
-    tide_data_w_time = gpd.GeoDataFrame()
+    # Create an empty list to store the tide data with time information for each group
+    tide_data_w_time_list = []
     # Iterate over each group in the grouped data
     for _, group_data in grouped:
         # Sort the group data by datetime
@@ -630,10 +881,14 @@ def add_time_information(
         group_data['seconds'] = group_data['mins'] * 60
         # Sort the group data by seconds
         group_data = group_data.sort_values(by="seconds").reset_index(drop=True)
-        # Concatenate the group data to the main tide data with time information
-        tide_data_w_time = pd.concat([tide_data_w_time, group_data])
-    # Reset the index of the tide data with time information
-    tide_data_w_time = gpd.GeoDataFrame(tide_data_w_time).reset_index(drop=True)
+        # Append the group data to the list of tide data with time information
+        tide_data_w_time_list.append(group_data)
+    # If there are no query locations, fall back to an empty frame with the tide data and time information columns
+    if not tide_data_w_time_list:
+        tide_data_w_time_list.append(tide_data.iloc[:0].assign(
+            mins=pd.Series(dtype=float), hours=pd.Series(dtype=float), seconds=pd.Series(dtype=float)))
+    # Concatenate the tide data with time information of all groups and reset the index
+    tide_data_w_time = gpd.GeoDataFrame(pd.concat(tide_data_w_time_list, ignore_index=True, copy=False))
     return tide_data_w_time
 
 
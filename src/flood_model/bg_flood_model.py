@@ -8,9 +8,10 @@ import logging
 import os
 import pathlib
 import platform
+import re
 import subprocess
 from datetime import datetime
-from typing import Tuple, Union, Optional, TextIO
+from typing import List, Tuple, Union, Optional
 
 import geopandas as gpd
 import xarray as xr
@@ -30,6 +31,9 @@ from src.flood_model.serve_model import add_model_output_to_geoserver
 
 log = logging.getLogger(__name__)
 
+# Pattern matching the names of the river input files written to the BG-Flood directory, e.g. 'river1_x_y.txt'
+RIVER_INPUT_FILE_PATTERN = re.compile(r"river[0-9].*_.*\.txt")
+
 Base = declarative_base()
 
 
@@ -157,20 +161,20 @@ def model_output_from_db_by_id(engine: Engine, model_id: int) -> pathlib.Path:
     pathlib.Path
         The path to the model output file
     """
-    # Execute a query to get the model output record based on the 'flood_model_id' column
-    query = text("SELECT * FROM bg_flood_model_output WHERE unique_id=:flood_model_id").bindparams(
+    # Execute a query to get only the model output file path based on the 'flood_model_id' column, so the stored
+    # extents geometry is not fetched along with it
+    query = text("SELECT file_path FROM bg_flood_model_output WHERE unique_id=:flood_model_id").bindparams(
         flood_model_id=model_id)
     # Check table exists before querying
     bg_flood_table = "bg_flood_model_output"
     if not check_table_exists(engine, bg_flood_table):
         raise FileNotFoundError(f"{bg_flood_table} table does not exist")
-    row = engine.execute(query).fetchone()
-    # If the row is empty then we could not find the model output
-    if row is None:
+    file_path = engine.execute(query).scalar()
+    # If no file path is returned then we could not find the model output
+    if file_path is None:
         raise FileNotFoundError(f"bg_flood_model_output table does not contain row with unique_id: {model_id}")
-    # Extract the file path from the retrieved record
-    latest_output_path = pathlib.Path(row["file_path"])
-    # Extract the file path from the retrieved record
+    # Convert the retrieved file path to a path object
+    latest_output_path = pathlib.Path(file_path)
     return latest_output_path
 
 
@@ -230,10 +234,14 @@ def add_crs_to_model_output(engine: Engine, flood_model_output_id: int) -> None:
         if latest_output.rio.crs is None:
             # Add the Coordinate Reference System (CRS) information to the dataset
             latest_output.rio.write_crs("epsg:2193", inplace=True)
-            # Set the spatial dimensions explicitly for proper interpretation
-            latest_output.rio.set_spatial_dims(x_dim="xx_P0", y_dim="yy_P0", inplace=True)
-            # Reproject the dataset to the specified CRS
-            latest_output = latest_output.rio.reproject("epsg:2193")
+            # Relabel the BG-Flood grid dimensions as the standard spatial dimensions. The model grid is already in
+            # the target CRS, so reprojecting would only resample the data onto the same grid
+            latest_output = latest_output.rename({"xx_P0": "x", "yy_P0": "y"})
+            # Flip the y-axis lazily if it is ascending, so the grid is north-up like a reprojected dataset
+            if latest_output.y[0] < latest_output.y[-1]:
+                latest_output = latest_output.isel(y=slice(None, None, -1))
+            # Record the affine transform of the north-up grid alongside the CRS information
+            latest_output.rio.write_transform(latest_output.rio.transform(recalc=True), inplace=True)
             # Save the modified dataset to the temporary file
             latest_output.to_netcdf(temp_file)
 
@@ -244,96 +252,123 @@ def add_crs_to_model_output(engine: Engine, flood_model_output_id: int) -> None:
     log.debug(f"Added CRS info to {model_output_file}")
 
 
-def process_rain_input_files(bg_flood_dir: pathlib.Path, param_file: TextIO) -> None:
+def get_bg_flood_input_file_names(bg_flood_dir: pathlib.Path) -> Tuple[List[str], List[str], List[str]]:
     """
-    Process rain input files and write their parameter values to the BG-Flood parameter file.
+    Get the names of the rain, uniform boundary, and river input files in the BG-Flood model directory using a single
+    directory pass.
+
+    Parameters
+    ----------
+    bg_flood_dir : pathlib.Path
+        The BG-Flood model directory containing the input files.
+
+    Returns
+    -------
+    Tuple[List[str], List[str], List[str]]
+        A tuple containing three elements: the names of the rain input files, the names of the uniform boundary input
+        files, and the names of the river input files.
+    """
+    # Initialise lists to store the names of each type of input file
+    rain_file_names, boundary_file_names, river_file_names = [], [], []
+    # Scan the BG-Flood directory once and partition the file names by input type
+    with os.scandir(bg_flood_dir) as dir_entries:
+        for entry in dir_entries:
+            file_name = entry.name
+            if file_name.startswith("rain_forcing."):
+                rain_file_names.append(file_name)
+            elif file_name.endswith("_bnd.txt"):
+                boundary_file_names.append(file_name)
+            elif RIVER_INPUT_FILE_PATTERN.fullmatch(file_name):
+                river_file_names.append(file_name)
+    return rain_file_names, boundary_file_names, river_file_names
+
+
+def process_rain_input_files(bg_flood_dir: pathlib.Path, rain_file_names: List[str]) -> List[str]:
+    """
+    Process rain input files and get their parameter lines for the BG-Flood parameter file.
 
     Parameters
     ----------
     bg_flood_dir : pathlib.Path
         The BG-Flood model directory containing the rain input files.
-    param_file : TextIO
-        The file object representing the parameter file where the parameter values will be written.
+    rain_file_names : List[str]
+        The names of the rain input files in the BG-Flood model directory.
 
     Returns
     -------
-    None
-        This function does not return any value.
+    List[str]
+        The rain parameter lines to be written to the BG-Flood parameter file.
     """
+    # Initialise a list to store the rain parameter lines
+    rain_param_lines = []
     # Loop through the rain input files in the BG-Flood directory
-    for rain_input_file_path in bg_flood_dir.glob('rain_forcing.*'):
-        # Extract the file extension from the rain input file
-        file_extension = rain_input_file_path.suffix[1:]
-        # Get the name of the rain input file
-        rain_file = rain_input_file_path.name
+    for rain_file in rain_file_names:
         # Check if the file extension is 'txt'
-        if file_extension == "txt":
-            # Write the plain text rain parameter line to the BG-Flood parameter file
-            param_file.write(f"rain = {rain_file};\n")
+        if rain_file.endswith(".txt"):
+            # Add the plain text rain parameter line
+            rain_param_lines.append(f"rain = {rain_file};\n")
         else:
             # If the input file is in netCDF format, read it using xarray and get the name of the rain variable
-            with xr.open_dataset(rain_input_file_path) as input_file:
+            with xr.open_dataset(bg_flood_dir / rain_file) as input_file:
                 rain_var_name = list(input_file.data_vars)[0]
-            # Write the netCDF rain parameter line to the BG-Flood parameter file
-            param_file.write(f"rain = {rain_file}?{rain_var_name};\n")
+            # Add the netCDF rain parameter line
+            rain_param_lines.append(f"rain = {rain_file}?{rain_var_name};\n")
+    return rain_param_lines
 
 
-def process_boundary_input_files(bg_flood_dir: pathlib.Path, param_file: TextIO) -> None:
+def process_boundary_input_files(boundary_file_names: List[str]) -> List[str]:
     """
-    Process uniform boundary input files and write their parameter values to the BG-Flood parameter file.
+    Process uniform boundary input files and get their parameter lines for the BG-Flood parameter file.
 
     Parameters
     ----------
-    bg_flood_dir : pathlib.Path
-        The BG-Flood model directory containing the uniform boundary input files.
-    param_file : TextIO
-        The file object representing the parameter file where the parameter values will be written.
+    boundary_file_names : List[str]
+        The names of the uniform boundary input files in the BG-Flood model directory.
 
     Returns
     -------
-    None
-        This function does not return any value.
+    List[str]
+        The boundary parameter lines to be written to the BG-Flood parameter file.
     """
-    # Loop through the boundary input files in the BG-Flood directory
-    for boundary_input_file_path in bg_flood_dir.glob('*_bnd.txt'):
-        # Extract the boundary position from the file name
-        boundary_position = boundary_input_file_path.stem.split('_')[0]
-        # Get the name of the boundary input file
-        boundary_file = boundary_input_file_path.name
-        # Write the boundary parameter line to the BG-Flood parameter file
-        param_file.write(f"{boundary_position} = {boundary_file},2;\n")
+    # Build the boundary parameter lines, using the boundary position at the start of each file name
+    boundary_param_lines = [
+        f"{boundary_file.split('_')[0]} = {boundary_file},2;\n"
+        for boundary_file in boundary_file_names
+    ]
+    return boundary_param_lines
 
 
-def process_river_input_files(bg_flood_dir: pathlib.Path, param_file: TextIO) -> None:
+def process_river_input_files(bg_flood_dir: pathlib.Path, river_file_names: List[str]) -> List[str]:
     """
-    Process river input files, rename them, and write their parameter values to the BG-Flood parameter file.
+    Process river input files, rename them, and get their parameter lines for the BG-Flood parameter file.
 
     Parameters
     ----------
     bg_flood_dir : pathlib.Path
         The BG-Flood model directory containing the river input files.
-    param_file : TextIO
-        The file object representing the parameter file where the parameter values will be written.
+    river_file_names : List[str]
+        The names of the river input files in the BG-Flood model directory.
 
     Returns
     -------
-    None
-        This function does not return any value.
+    List[str]
+        The river parameter lines to be written to the BG-Flood parameter file.
     """
+    # Initialise a list to store the river parameter lines
+    river_param_lines = []
     # Loop through the river input files in the BG-Flood directory
-    for river_input_file_path in bg_flood_dir.glob('river[0-9]*_*.txt'):
-        # Split the file name into parts based on underscores
-        file_name_parts = river_input_file_path.stem.split('_')
+    for river_file_name in river_file_names:
+        # Split the file name (without extension) into parts based on underscores
+        file_name_parts = river_file_name[:-len(".txt")].split('_')
         # Create the new file name by combining the first part and the file extension
-        new_river_file = file_name_parts[0] + river_input_file_path.suffix
-        # Create the new file path with the new name
-        new_file_path = river_input_file_path.with_name(new_river_file)
+        new_river_file = f"{file_name_parts[0]}.txt"
         # Rename the input file with the new name
-        river_input_file_path.rename(new_file_path)
+        os.rename(bg_flood_dir / river_file_name, bg_flood_dir / new_river_file)
         # Join the remaining parts of the file name with commas to form the extents parameter value
         extents = ','.join(file_name_parts[1:])
-        # Write the river parameter line to the BG-Flood parameter file
-        param_file.write(f"river = {new_river_file},{extents};\n")
+        # Add the river parameter line
+        river_param_lines.append(f"river = {new_river_file},{extents};\n")
+    return river_param_lines
 
 
 def prepare_bg_flood_model_inputs(
@@ -379,32 +414,39 @@ def prepare_bg_flood_model_inputs(
     None
         This function does not return any value.
     """
-    # Read the Hydro DEM file using xarray and get the name of the elevation variable
-    with xr.open_dataset(hydro_dem_path) as dem_file:
+    # Read the Hydro DEM file metadata using xarray and get the name of the elevation variable. Only the variable
+    # names are needed, so skip decoding times and masked/scaled values and do not cache any variable data
+    with xr.open_dataset(hydro_dem_path, decode_times=False, mask_and_scale=False, cache=False) as dem_file:
         elev_var_name = list(dem_file.data_vars)[1]
 
     # Construct the file path for the BG-Flood Model parameter file
     bg_param_file_path = bg_flood_dir / "BG_param.txt"
-
-    # Open the BG-Flood Model parameter file for writing
-    with open(bg_param_file_path, "w+") as param_file:
-        # Write general parameter values to the parameter file
-        param_file.write(f"topo = {hydro_dem_path.as_posix()}?{elev_var_name};\n"
-                         f"dx = {resolution};\n"
-                         f"outputtimestep = {output_timestep};\n"
-                         f"endtime = {end_time};\n"
-                         f"mask = {mask};\n"
-                         f"gpudevice = {gpu_device};\n"
-                         f"smallnc = {small_nc};\n"
-                         f"outfile = {model_output_path.as_posix()};\n"
-                         f"outvars = h, hmax, zb, zs, u, v;\n")
-
-        # Process rain input files and write their parameter values to the parameter file
-        process_rain_input_files(bg_flood_dir, param_file)
-        # Process uniform boundary input files and write their parameter values to the parameter file
-        process_boundary_input_files(bg_flood_dir, param_file)
-        # Process river input files, rename them, and write their parameter values to the parameter file
-        process_river_input_files(bg_flood_dir, param_file)
+    # Get the names of the rain, uniform boundary, and river input files in the BG-Flood directory
+    rain_file_names, boundary_file_names, river_file_names = get_bg_flood_input_file_names(bg_flood_dir)
+
+    # General parameter lines for the parameter file
+    general_param_lines = [
+        f"topo = {hydro_dem_path.as_posix()}?{elev_var_name};\n",
+        f"dx = {resolution};\n",
+        f"outputtimestep = {output_timestep};\n",
+        f"endtime = {end_time};\n",
+        f"mask = {mask};\n",
+        f"gpudevice = {gpu_device};\n",
+        f"smallnc = {small_nc};\n",
+        f"outfile = {model_output_path.as_posix()};\n",
+        "outvars = h, hmax, zb, zs, u, v;\n",
+    ]
+    # Process rain input files and get their parameter lines
+    rain_param_lines = process_rain_input_files(bg_flood_dir, rain_file_names)
+    # Process uniform boundary input files and get their parameter lines
+    boundary_param_lines = process_boundary_input_files(boundary_file_names)
+    # Process river input files, rename them, and get their parameter lines
+    river_param_lines = process_river_input_files(bg_flood_dir, river_file_names)
+
+    # Write all parameter lines to the BG-Flood Model parameter file in a single write
+    with open(bg_param_file_path, "w") as param_file:
+        param_file.write("".join(
+            general_param_lines + rain_param_lines + boundary_param_lines + river_param_lines))
 
 
 def run_bg_flood_model(
@@ -472,25 +514,22 @@ def run_bg_flood_model(
         gpu_device=gpu_device,
         small_nc=small_nc)
 
-    # Get the current working directory (cwd)
-    cwd = pathlib.Path.cwd()
-    # Change the current working directory to the BG-Flood Model directory
-    os.chdir(bg_flood_dir)
-    # Run the BG-Flood Model executable, accounting for OS differences
+    # Select the BG-Flood Model executable, accounting for OS differences
     operating_system = platform.system()
     if operating_system == "Windows":
-        # Run the .exe
-        subprocess.run([bg_flood_dir / "BG_flood.exe"], check=True)
+        # Use the .exe
+        bg_flood_executable = bg_flood_dir / "BG_flood.exe"
     elif operating_system == "Linux":
-        # Run the executable linux script
-        subprocess.run([bg_flood_dir / "BG_Flood"], check=True)
+        # Use the executable linux script
+        bg_flood_executable = bg_flood_dir / "BG_Flood"
     else:
         # Other OSs are not officially supported, but we can attempt to try the Linux one.
         log.warning(f"{operating_system} is not officially supported. Only Windows and Linux are officially supported.")
         log.warning(f"Attempting to run BG_Flood linux script in {operating_system}")
-        subprocess.run([bg_flood_dir / "BG_Flood"], check=True)
-    # Change the current working directory back to the original directory (cwd)
-    os.chdir(cwd)
+        bg_flood_executable = bg_flood_dir / "BG_Flood"
+    # Run the BG-Flood Model executable from within the BG-Flood Model directory, without changing the working
+    # directory of the current process
+    subprocess.run([bg_flood_executable], check=True, cwd=bg_flood_dir)
     log.info(f"Saved new flood model to {model_output_path}")
 
 
@@ -6,7 +6,9 @@ import rasterio as rio
 import shapely
 import xarray
 from sqlalchemy.engine import Engine
+from sqlalchemy.sql import text
 
+from src.digitaltwin import tables
 from src.flood_model.serve_model import create_building_database_views_if_not_exists
 
 
@@ -30,8 +32,8 @@ def store_flooded_buildings_in_database(engine: Engine, buildings: pd.DataFrame,
     """
     # Associate the building flood status dataframe with the current model id
     buildings["flood_model_id"] = flood_model_id
-    # Append the dataframe to the database
-    buildings.to_sql("building_flood_status", engine, if_exists="append", index=True)
+    # Append the dataframe to the database in a single COPY rather than row-by-row inserts
+    buildings.to_sql("building_flood_status", engine, if_exists="append", index=True, method=tables.psql_insert_copy)
     # Create geoserver endpoints for database views if they do not already exist
     create_building_database_views_if_not_exists()
 
@@ -118,16 +120,17 @@ def retrieve_building_outlines(engine: Engine, area_of_interest: gpd.GeoDataFram
     gpd.GeoDataFrame
         A GeoDataFrame containing all of the building outlines in the area
     """
-    # Get the area of interest polygon in well known text format for database querying
-    aoi_wkt = area_of_interest["geometry"][0].wkt
+    # Get the area of interest polygon in well known binary format for database querying
+    aoi_wkb = area_of_interest["geometry"][0].wkb
     crs = area_of_interest.crs.to_epsg()
     # Construct the query to find buildings within the area of interest
-    query = f"""
+    query = text("""
     SELECT building_outline_id, geometry FROM nz_building_outlines
-    WHERE ST_INTERSECTS(nz_building_outlines.geometry, ST_GeomFromText('{aoi_wkt}', {crs}));
-    """
+    WHERE ST_INTERSECTS(nz_building_outlines.geometry, ST_GeomFromWKB(:aoi_wkb, :crs));
+    """)
     # Execute the query and retrieve the result as a GeoDataFrame
-    gdf = gpd.GeoDataFrame.from_postgis(query, engine, index_col="building_outline_id", geom_col="geometry")
+    gdf = gpd.GeoDataFrame.from_postgis(
+        query, engine, index_col="building_outline_id", geom_col="geometry", params={"aoi_wkb": aoi_wkb, "crs": crs})
     return gdf
 
 
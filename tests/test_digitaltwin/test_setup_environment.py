@@ -1,5 +1,7 @@
+import importlib.util
 import os
 import unittest
+from unittest import mock
 
 import pytest
 from sqlalchemy.exc import OperationalError
@@ -45,6 +47,18 @@ class SetupEnvironmentTest(unittest.TestCase):
                                    " if the password supplied is incorrect"):
             setup_environment.get_connection_from_profile()
 
+    def test_import_without_register_at_fork(self):
+        """Ensure the module can be imported on platforms without os.register_at_fork (e.g. Windows)"""
+        # Load a separate copy of the module so the Base and ENGINES shared with the rest of the package are untouched
+        spec = importlib.util.spec_from_file_location("setup_environment_without_fork", setup_environment.__file__)
+        module = importlib.util.module_from_spec(spec)
+        # Remove os.register_at_fork for the duration of the import, as on platforms that cannot fork
+        with mock.patch.object(os, "register_at_fork"):
+            del os.register_at_fork
+            spec.loader.exec_module(module)
+        self.assertTrue(hasattr(os, "register_at_fork"))
+        self.assertEqual(module.ENGINES, {})
+
 
 if __name__ == '__main__':
     unittest.main()
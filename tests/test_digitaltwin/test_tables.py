@@ -0,0 +1,68 @@
+import unittest
+from typing import Iterable, List
+from unittest import mock
+
+import pandas as pd
+from sqlalchemy import create_engine
+
+from src.digitaltwin import tables
+
+
+class PsqlInsertCopyTest(unittest.TestCase):
+    """Tests for psql_insert_copy in tables.py."""
+
+    def copy_with_psql_insert_copy(self, data: pd.DataFrame) -> str:
+        """
+        Write the data with pd.DataFrame.to_sql(method=psql_insert_copy), capturing the CSV data passed to COPY.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            The data to write with psql_insert_copy.
+
+        Returns
+        -------
+        str
+            The CSV data that psql_insert_copy passes to COPY.
+        """
+        cursor = mock.MagicMock()
+        copied = {}
+
+        def capture_copy(sql: str, file) -> None:
+            copied["sql"] = sql
+            copied["csv"] = file.read()
+
+        cursor.copy_expert.side_effect = capture_copy
+
+        def insert_copy(table, conn, keys: List[str], data_iter: Iterable[tuple]) -> None:
+            # Replace the database connection with one whose cursor captures the COPY statement and CSV data
+            copy_conn = mock.MagicMock()
+            copy_conn.connection.cursor.return_value.__enter__.return_value = cursor
+            tables.psql_insert_copy(table, copy_conn, keys, data_iter)
+
+        # Use an in-memory database so that pandas builds the rows exactly as for the PostgreSQL database
+        data.to_sql("rain_table", create_engine("sqlite://"), index=False, method=insert_copy)
+        self.assertEqual('COPY "rain_table" ("site_id", "category", "rcp", "time_period") FROM STDIN WITH CSV',
+                         copied["sql"])
+        return copied["csv"]
+
+    def test_missing_values_are_copied_as_null(self):
+        """Check that missing values, e.g. the rcp and time_period of historical rainfall data, are written as
+        unquoted empty fields, which COPY loads as NULL as INSERT statements would."""
+        rain_data = pd.DataFrame({
+            "site_id": ["323605", "323605"],
+            "category": ["hist", "proj"],
+            "rcp": [float("nan"), 2.6],
+            "time_period": [None, "2031-2050"],
+        })
+        self.assertEqual("323605,hist,,\n323605,proj,2.6,2031-2050\n", self.copy_with_psql_insert_copy(rain_data))
+
+    def test_empty_strings_are_copied_as_null(self):
+        """Check that empty strings are also written as unquoted empty fields, so COPY loads them as NULL, unlike
+        INSERT statements. psql_insert_copy must only be used for data without empty strings."""
+        rain_data = pd.DataFrame({"site_id": ["323605"], "category": [""], "rcp": [2.6], "time_period": [""]})
+        self.assertEqual("323605,,2.6,\n", self.copy_with_psql_insert_copy(rain_data))
+
+
+if __name__ == "__main__":
+    unittest.main()
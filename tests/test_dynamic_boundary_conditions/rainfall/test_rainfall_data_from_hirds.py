@@ -2,6 +2,7 @@ import unittest
 import pathlib
 from typing import List, Optional
 import math
+from io import StringIO
 
 import pandas as pd
 
@@ -131,27 +132,54 @@ class RainfallDataFromHirdsTest(unittest.TestCase):
         for block_structure in block_structures:
             self.assertEqual("proj", block_structure.category)
 
-    def test_convert_to_tabular_data_correct_frame_type(self):
+    def test_convert_layout_to_tabular_data_correct_frame_type(self):
         """Test that each block of rainfall depths and intensities data has been converted to a DataFrame."""
         site_data = [self.rainfall_depth, self.rainfall_intensity, self.depth_historical]
         layout_structure = [self.depth_layout, self.intensity_layout, self.depth_hist_layout]
 
         for i in range(len(site_data)):
             for block_structure in layout_structure[i]:
-                rain_table = rainfall_data_from_hirds.convert_to_tabular_data(
-                    site_data[i], self.example_site_id, block_structure)
+                rain_table = rainfall_data_from_hirds.convert_layout_to_tabular_data(
+                    site_data[i], self.example_site_id, [block_structure])
                 self.assertIsInstance(rain_table, pd.DataFrame)
 
-    def test_convert_to_tabular_data_correct_rows_columns(self):
+    def test_convert_layout_to_tabular_data_correct_rows_columns(self):
         """Test that each converted DataFrame contains the same correct number of rows and columns."""
         site_data = [self.rainfall_depth, self.rainfall_intensity, self.depth_historical]
         layout_structure = [self.depth_layout, self.intensity_layout, self.depth_hist_layout]
 
         for i in range(len(site_data)):
             for block_structure in layout_structure[i]:
-                rain_table = rainfall_data_from_hirds.convert_to_tabular_data(
-                    site_data[i], self.example_site_id, block_structure)
+                rain_table = rainfall_data_from_hirds.convert_layout_to_tabular_data(
+                    site_data[i], self.example_site_id, [block_structure])
                 self.assertEqual((12, 18), rain_table.shape)
+            rain_table = rainfall_data_from_hirds.convert_layout_to_tabular_data(
+                site_data[i], self.example_site_id, layout_structure[i])
+            self.assertEqual((12 * len(layout_structure[i]), 18), rain_table.shape)
+
+    def test_convert_layout_to_tabular_data_matches_each_block(self):
+        """Test that converting all blocks at once gives the same data as reading each block separately."""
+        site_data = [self.rainfall_depth, self.rainfall_intensity, self.depth_historical]
+        layout_structure = [self.depth_layout, self.intensity_layout, self.depth_hist_layout]
+
+        for i in range(len(site_data)):
+            rain_table = rainfall_data_from_hirds.convert_layout_to_tabular_data(
+                site_data[i], self.example_site_id, layout_structure[i])
+            for block_index, (skip_rows, rcp, time_period, category) in enumerate(layout_structure[i]):
+                # Read the 12 rows of data of the block directly from the fetched rainfall data
+                block_data = pd.read_csv(StringIO(site_data[i]), skiprows=skip_rows, nrows=12)
+                block_data.columns = block_data.columns.str.lower()
+                block_table = rain_table.iloc[block_index * 12:(block_index + 1) * 12].reset_index(drop=True)
+                pd.testing.assert_frame_equal(block_data, block_table[block_data.columns])
+                # Check the block information added to each row of the block
+                self.assertTrue((block_table["site_id"] == self.example_site_id).all())
+                self.assertTrue((block_table["category"] == category).all())
+                if math.isnan(rcp):
+                    self.assertTrue(block_table["rcp"].isna().all())
+                    self.assertTrue(block_table["time_period"].isna().all())
+                else:
+                    self.assertTrue((block_table["rcp"] == rcp).all())
+                    self.assertTrue((block_table["time_period"] == time_period).all())
 
     def test_get_site_url_key_not_empty(self):
         """Test to ensure that the site url key for both rainfall depths and intensities data fetched from
@@ -1,4 +1,5 @@
 import unittest
+from typing import Tuple
 from unittest.mock import patch
 
 import geopandas as gpd
@@ -34,32 +35,68 @@ class RainfallModelInputTest(unittest.TestCase):
         catchment_area_crs_transformed = catchment_area.to_crs(to_crs)
         return catchment_area_crs_transformed
 
+    @staticmethod
+    def get_sorted_unique_mask(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sort each row of a 2D array and mark the first occurrence of each unique value within each row.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            The 2D array whose rows are to be sorted.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            A tuple containing the row-sorted array and a boolean mask of the same shape that is True at the first
+            occurrence of each unique value within each row.
+        """
+        # Sort the values within each row
+        sorted_values = np.sort(values, axis=1)
+        # Mark the first value of each row and every value that differs from the previous value in its row
+        unique_mask = np.ones_like(sorted_values, dtype=bool)
+        unique_mask[:, 1:] = sorted_values[:, 1:] != sorted_values[:, :-1]
+        return sorted_values, unique_mask
+
     @classmethod
     def setUpClass(cls):
         """Get all relevant data used for testing."""
         data_dir = "tests/test_dynamic_boundary_conditions/rainfall/data"
         cls.catchment_area = cls.get_catchment_area(f"{data_dir}/selected_polygon.geojson")
+        cls.catchment_polygon = cls.catchment_area["geometry"].iloc[0]
         cls.sites_in_catchment = gpd.read_file(f"{data_dir}/sites_in_catchment.geojson")
         cls.intersections = gpd.read_file(f"{data_dir}/intersections.geojson")
         cls.sites_coverage = gpd.read_file(f"{data_dir}/sites_coverage.geojson")
-        cls.hyetograph_data_alt_block = pd.read_csv(f"{data_dir}/hyetograph_data_alt_block.txt")
-        cls.hyetograph_data_chicago = pd.read_csv(f"{data_dir}/hyetograph_data_chicago.txt")
+        cls.hyetograph_data_alt_block = pd.read_csv(f"{data_dir}/hyetograph_data_alt_block.txt", engine="pyarrow")
+        cls.hyetograph_data_chicago = pd.read_csv(f"{data_dir}/hyetograph_data_chicago.txt", engine="pyarrow")
+        # Intersections of the loaded sites with the catchment area, shared by the tests that check them
+        cls.sites_voronoi_intersections = rainfall_model_input.sites_voronoi_intersect_catchment(
+            cls.sites_in_catchment, cls.catchment_area)
+        # Area sizes (km2) of the sites and intersections, reprojected together in a single pass and shared across
+        # tests, keeping the original index of each
+        area_sizes = pd.concat(
+            [cls.sites_in_catchment.geometry, cls.intersections.geometry, cls.sites_voronoi_intersections.geometry],
+            keys=["sites_in_catchment", "intersections", "sites_voronoi_intersections"]).to_crs(3857).area / 1e6
+        cls.sites_in_catchment_area_km2 = area_sizes.loc["sites_in_catchment"]
+        cls.intersections_area_km2 = area_sizes.loc["intersections"]
+        cls.sites_voronoi_intersections_area_km2 = area_sizes.loc["sites_voronoi_intersections"]
+        # Mean catchment rainfall for each hyetograph, computed once and shared by the tests that check it
+        cls.hyetograph_data_dict = {"alt_block": cls.hyetograph_data_alt_block, "chicago": cls.hyetograph_data_chicago}
+        cls.mean_catchment_rain_dict = {
+            hyetograph_name: rainfall_model_input.mean_catchment_rainfall(hyetograph_data, cls.sites_coverage)
+            for hyetograph_name, hyetograph_data in cls.hyetograph_data_dict.items()}
 
     def test_sites_voronoi_intersect_catchment_within_catchment(self):
         """Test to ensure returned intersections (overlapped areas) are each within the catchment area."""
-        intersections = rainfall_model_input.sites_voronoi_intersect_catchment(
-            self.sites_in_catchment, self.catchment_area)
-        catchment_polygon = self.catchment_area["geometry"].iloc[0]
-        result = intersections.within(catchment_polygon.buffer(1 / 1e13)).all()
+        intersections = self.sites_voronoi_intersections
+        result = intersections.covered_by(self.catchment_polygon).all()
         self.assertTrue(result)
 
     def test_sites_voronoi_intersect_catchment_area_size(self):
         """Test to ensure the area size of each returned intersection (overlapped areas) is not greater than
         its original area size."""
-        intersections = rainfall_model_input.sites_voronoi_intersect_catchment(
-            self.sites_in_catchment, self.catchment_area)
-        org_area_sizes = self.sites_in_catchment.to_crs(3857).area / 1e6
-        intersection_area_sizes = intersections.to_crs(3857).area / 1e6
+        org_area_sizes = self.sites_in_catchment_area_km2
+        intersection_area_sizes = self.sites_voronoi_intersections_area_km2
         result = intersection_area_sizes.gt(org_area_sizes).any()
         self.assertFalse(result)
 
@@ -72,44 +109,51 @@ class RainfallModelInputTest(unittest.TestCase):
             sites_in_catchment=gpd.GeoDataFrame(),
             catchment_area=gpd.GeoDataFrame())
 
-        sites_area = (self.intersections.to_crs(3857).area / 1e6)
+        sites_area = self.intersections_area_km2
         sites_area_percent = sites_area / sites_area.sum()
-        pd.testing.assert_series_equal(sites_area_percent, sites_coverage["area_percent"], check_names=False)
+        pd.testing.assert_index_equal(sites_area_percent.index, sites_coverage.index, exact="equiv")
+        np.testing.assert_allclose(sites_coverage["area_percent"].to_numpy(), sites_area_percent.to_numpy())
         self.assertEqual(1, sites_coverage["area_percent"].sum())
 
     def test_mean_catchment_rainfall_correct_calculation(self):
         """Test to ensure the returned data have been calculated correctly (ignore rounding)."""
-        site_area_percent = self.sites_coverage[["site_id", "area_percent"]]
-        hyetograph_data_list = [self.hyetograph_data_alt_block, self.hyetograph_data_chicago]
-        for hyetograph_data in hyetograph_data_list:
-            mean_catchment_rain = rainfall_model_input.mean_catchment_rainfall(hyetograph_data, self.sites_coverage)
-            for row_index in range(len(hyetograph_data)):
-                row_hyeto_data = hyetograph_data.iloc[row_index, :-3]
-                row_hyeto_data = row_hyeto_data.to_frame(name="rain_intensity_mmhr").reset_index(names="site_id")
-                row_hyeto_data = pd.merge(row_hyeto_data, site_area_percent, how="left", on="site_id", validate="1:1")
-                row_mean_catchment_rain = (row_hyeto_data["rain_intensity_mmhr"] * row_hyeto_data["area_percent"]).sum()
-                self.assertAlmostEqual(
-                    row_mean_catchment_rain, mean_catchment_rain["rain_intensity_mmhr"].iloc[row_index])
+        site_area_percent = self.sites_coverage.set_index("site_id", verify_integrity=True)["area_percent"]
+        for hyetograph_name, hyetograph_data in self.hyetograph_data_dict.items():
+            with self.subTest(hyetograph=hyetograph_name):
+                mean_catchment_rain = self.mean_catchment_rain_dict[hyetograph_name]
+                site_intensities = hyetograph_data.iloc[:, :-3]
+                site_weights = site_area_percent.loc[site_intensities.columns].to_numpy()
+                expected_mean_catchment_rain = site_intensities.to_numpy() @ site_weights
+                np.testing.assert_allclose(
+                    mean_catchment_rain["rain_intensity_mmhr"].to_numpy(), expected_mean_catchment_rain,
+                    rtol=0, atol=5e-8)
 
     def test_mean_catchment_rainfall_correct_rows(self):
         """Test to ensure the returned data have correct number of rows."""
-        hyetograph_data_list = [self.hyetograph_data_alt_block, self.hyetograph_data_chicago]
-        for hyetograph_data in hyetograph_data_list:
-            mean_catchment_rain = rainfall_model_input.mean_catchment_rainfall(hyetograph_data, self.sites_coverage)
-            self.assertEqual(len(hyetograph_data), len(mean_catchment_rain))
+        for hyetograph_name, hyetograph_data in self.hyetograph_data_dict.items():
+            with self.subTest(hyetograph=hyetograph_name):
+                self.assertEqual(len(hyetograph_data), len(self.mean_catchment_rain_dict[hyetograph_name]))
 
     def test_create_rain_data_cube_correct_intensity_in_data_cube(self):
         """Test to ensure the returned rain data cube has correct intensity for each time slice."""
-        hyetograph_data_list = [self.hyetograph_data_alt_block, self.hyetograph_data_chicago]
-        for hyetograph_data in hyetograph_data_list:
-            rain_data_cube = rainfall_model_input.create_rain_data_cube(hyetograph_data, self.sites_coverage)
-            for row_index in range(len(hyetograph_data)):
-                row_unique_intensity = np.sort(hyetograph_data.iloc[row_index, :-3].unique()).tolist()
-                time_slice = rain_data_cube.sel(time=hyetograph_data.iloc[row_index]["seconds"])
-                time_slice_intensity = time_slice.data_vars["rain_intensity_mmhr"]
-                time_slice_unique_intensity = np.unique(time_slice_intensity)[np.unique(time_slice_intensity) != 0]
-                time_slice_unique_intensity = np.sort(time_slice_unique_intensity).tolist()
-                self.assertEqual(row_unique_intensity, time_slice_unique_intensity)
+        # Number of time slices compared at once, which bounds the memory used to sort the data cube
+        time_block_size = 32
+        for hyetograph_name, hyetograph_data in self.hyetograph_data_dict.items():
+            with self.subTest(hyetograph=hyetograph_name):
+                rain_data_cube = rainfall_model_input.create_rain_data_cube(hyetograph_data, self.sites_coverage)
+                row_sorted, row_unique_mask = self.get_sorted_unique_mask(hyetograph_data.iloc[:, :-3].to_numpy())
+                rain_intensity = rain_data_cube["rain_intensity_mmhr"]
+                seconds = hyetograph_data["seconds"].to_numpy()
+                for block_start in range(0, len(hyetograph_data), time_block_size):
+                    block = slice(block_start, block_start + time_block_size)
+                    time_slices = rain_intensity.sel(time=seconds[block]).transpose("time", ...)
+                    time_slice_intensity = time_slices.to_numpy().reshape(len(time_slices), -1)
+                    time_slice_sorted, time_slice_unique_mask = self.get_sorted_unique_mask(time_slice_intensity)
+                    time_slice_unique_mask &= time_slice_sorted != 0
+                    np.testing.assert_array_equal(
+                        row_unique_mask[block].sum(axis=1), time_slice_unique_mask.sum(axis=1))
+                    np.testing.assert_array_equal(
+                        row_sorted[block][row_unique_mask[block]], time_slice_sorted[time_slice_unique_mask])
 
 
 if __name__ == "__main__":